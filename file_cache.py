@@ -0,0 +1,70 @@
+"""
+File Cache Module
+Small on-disk cache for data fetched from the network (ETF info)
+so repeat sessions read from disk instead of re-hitting Yahoo
+"""
+
+import os
+import json
+import hashlib
+from datetime import datetime, timedelta
+
+
+class FileCache:
+    """
+    On-disk cache keyed by (symbol, endpoint, params)
+
+    Layout: {cache_dir}/{symbol}/{endpoint}_{md5(params)}.json
+    - Values are stored as JSON (non-serializable leaves fall back to str)
+    - Entries older than the TTL are treated as misses
+    - Read/write failures are never fatal: a corrupt entry is just a miss
+    """
+
+    def __init__(self, cache_dir="data_cache"):
+        self.cache_dir = cache_dir
+
+    def _path(self, symbol, endpoint, params):
+        """File path for one cache entry"""
+        digest = hashlib.md5(repr(params).encode()).hexdigest()
+        safe_symbol = str(symbol).replace(os.sep, '_') or '_'
+        return os.path.join(self.cache_dir, safe_symbol, f"{endpoint}_{digest}.json")
+
+    @staticmethod
+    def _is_fresh(path, ttl):
+        """True if the file exists and is younger than ttl (None = never expires)"""
+        if not os.path.exists(path):
+            return False
+        if ttl is None:
+            return True
+        if not isinstance(ttl, timedelta):
+            ttl = timedelta(seconds=ttl)
+        file_mtime = datetime.fromtimestamp(os.path.getmtime(path))
+        return datetime.now() - file_mtime < ttl
+
+    def get(self, symbol, endpoint, params=(), ttl=timedelta(days=1)):
+        """Return the cached value, or None on a miss or stale entry"""
+        path = self._path(symbol, endpoint, params)
+        try:
+            if self._is_fresh(path, ttl):
+                with open(path, 'r') as f:
+                    return json.load(f)
+        except Exception:
+            # Corrupt entry - fall through to a miss
+            pass
+        return None
+
+    def set(self, symbol, endpoint, value, params=()):
+        """Store a value; returns True if it was written"""
+        path = self._path(symbol, endpoint, params)
+        tmp_path = f"{path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                json.dump(value, f, default=str)
+            # Atomic swap so concurrent sessions never read a half-written file
+            os.replace(tmp_path, path)
+            return True
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
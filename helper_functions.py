@@ -22,6 +22,7 @@ from datetime import datetime, timedelta
 import json
 import os
 import pyfolio as pf
+from file_cache import FileCache
 from scipy.optimize import minimize
 from scipy import stats
 import warnings
@@ -36,6 +37,27 @@ except ImportError:
     print("⚠️ pykalman not available. Install with: pip install pykalman")
     print("   Kalman filter signals will be disabled.")
 
+# Numba JIT for rolling-window kernels (optional - NumPy fallback otherwise)
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# CuPy for very large efficient-frontier sweeps on a CUDA GPU (optional)
+try:
+    import cupy
+    CUPY_AVAILABLE = bool(cupy.cuda.is_available())
+except Exception:
+    CUPY_AVAILABLE = False
+
+# Ledoit-Wolf covariance shrinkage (scikit-learn is pulled in by pyfolio-reloaded)
+try:
+    from sklearn.covariance import ledoit_wolf
+    SKLEARN_AVAILABLE = True
+except ImportError:
+    SKLEARN_AVAILABLE = False
+
 
 # =============================================================================
 # TECHNICAL ANALYSIS FUNCTIONS (AlphaPy-Inspired)
@@ -1545,6 +1567,26 @@ METRIC_EXPLANATIONS = {
 # OPENBB HELPER FUNCTIONS - PHASE 1 FEATURES
 # =============================================================================
 
+# Persistent cache for slow network lookups that survive app restarts
+_FILE_CACHE = FileCache("data_cache")
+ETF_INFO_TTL = timedelta(days=1)
+
+
+def get_etf_info_yf(symbol):
+    """
+    Get the yfinance info dict for an ETF
+    Served from the on-disk cache when fetched within the last day
+    """
+    info = _FILE_CACHE.get(symbol, 'info', ttl=ETF_INFO_TTL)
+    if info is not None:
+        return info
+    
+    info = yf.Ticker(symbol).info
+    if info:
+        _FILE_CACHE.set(symbol, 'info', info)
+    return info
+
+
 @st.cache_data(ttl=3600)  # Cache for 1 hour
 def get_etf_info_openbb(symbol):
     """
@@ -1627,32 +1669,45 @@ def get_benchmark_data_openbb(benchmark_symbol, start_date, end_date):
         return None
 
 
+# Common ETF alternatives database (static, built once at import)
+_ETF_ALTERNATIVES = {
+    'SPY': [
+        {'symbol': 'VOO', 'name': 'Vanguard S&P 500', 'expense_ratio': 0.0003, 'tracking': 'Perfect'},
+        {'symbol': 'IVV', 'name': 'iShares Core S&P 500', 'expense_ratio': 0.0003, 'tracking': 'Perfect'}
+    ],
+    'QQQ': [
+        {'symbol': 'QQQM', 'name': 'Invesco NASDAQ 100', 'expense_ratio': 0.0015, 'tracking': 'Perfect'}
+    ],
+    'IWM': [
+        {'symbol': 'VTWO', 'name': 'Vanguard Russell 2000', 'expense_ratio': 0.0010, 'tracking': 'Very Good'}
+    ],
+    'AGG': [
+        {'symbol': 'BND', 'name': 'Vanguard Total Bond', 'expense_ratio': 0.0003, 'tracking': 'Excellent'}
+    ],
+    'VTI': [
+        {'symbol': 'ITOT', 'name': 'iShares Core S&P Total', 'expense_ratio': 0.0003, 'tracking': 'Excellent'}
+    ]
+}
+
+
+# Columnar view of the table: one DataFrame per ETF with symbol/name/expense_ratio/tracking columns
+_ETF_ALTERNATIVE_COLUMNS = ['symbol', 'name', 'expense_ratio', 'tracking']
+_ETF_ALTERNATIVE_FRAMES = {
+    symbol: pd.DataFrame(rows, columns=_ETF_ALTERNATIVE_COLUMNS)
+    for symbol, rows in _ETF_ALTERNATIVES.items()
+}
+
+
 def get_cheaper_etf_alternatives(symbol, expense_ratio):
     """
     Find cheaper alternatives to an ETF
-    Returns list of similar ETFs with lower expense ratios
-    """
-    # Common ETF alternatives database
-    alternatives = {
-        'SPY': [
-            {'symbol': 'VOO', 'name': 'Vanguard S&P 500', 'expense_ratio': 0.0003, 'tracking': 'Perfect'},
-            {'symbol': 'IVV', 'name': 'iShares Core S&P 500', 'expense_ratio': 0.0003, 'tracking': 'Perfect'}
-        ],
-        'QQQ': [
-            {'symbol': 'QQQM', 'name': 'Invesco NASDAQ 100', 'expense_ratio': 0.0015, 'tracking': 'Perfect'}
-        ],
-        'IWM': [
-            {'symbol': 'VTWO', 'name': 'Vanguard Russell 2000', 'expense_ratio': 0.0010, 'tracking': 'Very Good'}
-        ],
-        'AGG': [
-            {'symbol': 'BND', 'name': 'Vanguard Total Bond', 'expense_ratio': 0.0003, 'tracking': 'Excellent'}
-        ],
-        'VTI': [
-            {'symbol': 'ITOT', 'name': 'iShares Core S&P Total', 'expense_ratio': 0.0003, 'tracking': 'Excellent'}
-        ]
-    }
-    
-    return alternatives.get(symbol, [])
+    Returns DataFrame of similar ETFs (symbol, name, expense_ratio, tracking),
+    empty when none are known
+    """
+    frame = _ETF_ALTERNATIVE_FRAMES.get(symbol)
+    if frame is None:
+        return pd.DataFrame(columns=_ETF_ALTERNATIVE_COLUMNS)
+    return frame.copy()
 
 
 def interpret_economic_regime(econ_data):
@@ -1731,7 +1786,11 @@ def get_upcoming_economic_events():
 def calculate_expense_ratio_savings(current_ratio, new_ratio, portfolio_value):
     """
     Calculate annual savings from switching to cheaper ETF
+    
+    new_ratio may be a scalar or an array of alternative expense ratios;
+    the results then come back as arrays of the same shape.
     """
+    new_ratio = np.asarray(new_ratio, dtype=float)
     current_cost = portfolio_value * current_ratio
     new_cost = portfolio_value * new_ratio
     annual_savings = current_cost - new_cost
@@ -1740,13 +1799,21 @@ def calculate_expense_ratio_savings(current_ratio, new_ratio, portfolio_value):
     years = 20
     annual_return = 0.08  # Assume 8% annual return
     
-    # Future value of savings invested at 8% annually
-    fv_savings = sum(annual_savings * ((1 + annual_return) ** (years - i)) for i in range(years))
+    # Future value of savings invested at 8% annually:
+    # sum of (1 + r)^k for k = 1..years, as a closed-form geometric series
+    growth = 1 + annual_return
+    fv_factor = growth * (growth ** years - 1) / annual_return
+    fv_savings = annual_savings * fv_factor
+    
+    if current_ratio > 0:
+        percent_cheaper = (current_ratio - new_ratio) / current_ratio * 100
+    else:
+        percent_cheaper = np.zeros_like(annual_savings)
     
     return {
         'annual_savings': annual_savings,
         'savings_20y': fv_savings,
-        'percent_cheaper': ((current_ratio - new_ratio) / current_ratio * 100) if current_ratio > 0 else 0
+        'percent_cheaper': percent_cheaper
     }
 
 
@@ -2112,13 +2179,67 @@ def calculate_portfolio_returns(prices, weights):
     return portfolio_returns
 
 
+@st.cache_data(show_spinner=False)
+def estimate_annual_moments(prices):
+    """
+    Annualized mean returns and covariance used by the optimizer and frontier
+    
+    The covariance is Ledoit-Wolf shrunk towards a scaled identity, which is
+    much better conditioned than the raw sample covariance and gives less
+    concentrated optimal weights. Falls back to the sample covariance when
+    scikit-learn is not installed.
+    """
+    returns = prices.pct_change().dropna()
+    mean_returns = returns.mean().to_numpy() * 252
+    
+    if SKLEARN_AVAILABLE:
+        cov_matrix, _ = ledoit_wolf(returns.to_numpy())
+    else:
+        cov_matrix = returns.cov().to_numpy()
+    
+    return mean_returns, cov_matrix * 252
+
+
+def _max_sharpe_qp(mean_returns, cov_matrix):
+    """
+    Long-only max-Sharpe weights via the convex reformulation
+    
+    Substituting y = w / (mu'w) turns the ratio into a QP:
+        minimize y' S y   s.t.   mu'y = 1,  y >= 0
+    and the weights are w = y / sum(y). The problem is convex, so SLSQP
+    with analytic gradients converges to the global optimum in a few steps.
+    Returns None when no asset has a positive expected return.
+    """
+    positive = mean_returns > 0
+    if not positive.any():
+        return None
+    
+    # Feasible start: equal weight on the positive-return assets
+    y0 = positive.astype(float)
+    y0 /= mean_returns @ y0
+    
+    result = minimize(
+        lambda y: y @ cov_matrix @ y,
+        y0,
+        jac=lambda y: 2 * (cov_matrix @ y),
+        method='SLSQP',
+        bounds=[(0, None)] * len(mean_returns),
+        constraints=({'type': 'eq', 'fun': lambda y: mean_returns @ y - 1,
+                      'jac': lambda y: mean_returns},),
+        options={'ftol': 1e-12, 'maxiter': 200}
+    )
+    
+    total = result.x.sum()
+    if not result.success or total <= 0:
+        return None
+    return result.x / total
+
+
 def optimize_portfolio(prices, method='max_sharpe'):
     """
     Optimize portfolio weights
     """
-    returns = prices.pct_change().dropna()
-    mean_returns = returns.mean() * 252
-    cov_matrix = returns.cov() * 252
+    mean_returns, cov_matrix = estimate_annual_moments(prices)
     
     num_assets = len(prices.columns)
     
@@ -2136,36 +2257,116 @@ def optimize_portfolio(prices, method='max_sharpe'):
     initial_guess = num_assets * [1. / num_assets]
     
     if method == 'max_sharpe':
+        # Convex QP form first; the direct Sharpe search is only needed when
+        # no asset has a positive expected return
+        qp_weights = _max_sharpe_qp(mean_returns, cov_matrix)
+        if qp_weights is not None:
+            return qp_weights
+        
         result = minimize(neg_sharpe, initial_guess, method='SLSQP', 
                          bounds=bounds, constraints=constraints)
     
     return result.x if result.success else initial_guess
 
 
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True, nogil=True, parallel=True)
+    def _efficient_frontier_kernel(mean_returns, cov_matrix, num_portfolios):
+        """Random simplex portfolios (normalized exponentials) and their return/volatility, one per prange iteration"""
+        # float32 storage; the per-portfolio sums accumulate in float64 scalars
+        k = mean_returns.shape[0]
+        weights = np.empty((num_portfolios, k), dtype=np.float32)
+        port_returns = np.empty(num_portfolios, dtype=np.float32)
+        port_std = np.empty(num_portfolios, dtype=np.float32)
+        
+        for i in prange(num_portfolios):
+            total = 0.0
+            for j in range(k):
+                e = -np.log(1.0 - np.random.random())
+                weights[i, j] = e
+                total += e
+            
+            ret = 0.0
+            for j in range(k):
+                weights[i, j] /= total
+                ret += mean_returns[j] * weights[i, j]
+            
+            var = 0.0
+            for j in range(k):
+                row = 0.0
+                for m in range(k):
+                    row += cov_matrix[j, m] * weights[i, m]
+                var += weights[i, j] * row
+            
+            port_returns[i] = ret
+            port_std[i] = np.sqrt(var)
+        
+        return weights, port_returns, port_std
+
+
+# Below this many portfolios the host->device transfer outweighs the GPU speedup
+GPU_FRONTIER_MIN_PORTFOLIOS = 20000
+
+
+def _efficient_frontier_gpu(mean_returns, cov_matrix, num_portfolios):
+    """
+    Random simplex portfolios and their return/volatility on the GPU
+    
+    Variances use the Cholesky factor (S = L L'), so w'Sw = ||w L||^2 is one
+    GEMM plus a row-wise sum of squares.
+    """
+    mu = cupy.asarray(mean_returns)
+    chol = cupy.asarray(np.linalg.cholesky(cov_matrix))
+    
+    weights = cupy.random.standard_exponential((num_portfolios, mu.shape[0]), dtype=mu.dtype)
+    weights /= weights.sum(axis=1, keepdims=True)
+    
+    portfolio_returns = weights @ mu
+    portfolio_std = cupy.sqrt(cupy.sum((weights @ chol) ** 2, axis=1))
+    
+    return cupy.asnumpy(weights), cupy.asnumpy(portfolio_returns), cupy.asnumpy(portfolio_std)
+
+
 def calculate_efficient_frontier(prices, num_portfolios=100):
     """
     Calculate efficient frontier for visualization
+    
+    Random portfolios are drawn uniformly on the weight simplex (normalized
+    exponentials, i.e. Dirichlet(1)) by the first available path:
+    - CuPy, for sweeps of GPU_FRONTIER_MIN_PORTFOLIOS (20k) or more: one GEMM
+      against the Cholesky factor on the GPU
+    - numba: a parallel prange kernel, one portfolio per iteration
+    - otherwise np.random.dirichlet, evaluated as one matrix product plus one
+      einsum quadratic form
+    
+    Returns:
+        results: (3, num_portfolios) float32 array of [return, volatility, sharpe]
+        weights_array: (num_portfolios, num_assets) float32 array of weights
     """
-    returns = prices.pct_change().dropna()
-    mean_returns = returns.mean() * 252
-    cov_matrix = returns.cov() * 252
+    # Moments are estimated in float64 (once, cached); the sweep itself only needs
+    # float32, which halves the memory traffic of the (N, K) weight matrix
+    mean_returns, cov_matrix = estimate_annual_moments(prices)
+    mean_returns = np.ascontiguousarray(mean_returns, dtype=np.float32)
+    cov_matrix = np.ascontiguousarray(cov_matrix, dtype=np.float32)
     
     num_assets = len(prices.columns)
-    results = np.zeros((3, num_portfolios))
-    weights_array = []
     
-    for i in range(num_portfolios):
-        weights = np.random.random(num_assets)
-        weights /= np.sum(weights)
-        weights_array.append(weights)
-        
-        portfolio_return = np.sum(mean_returns * weights)
-        portfolio_std = np.sqrt(np.dot(weights.T, np.dot(cov_matrix, weights)))
-        sharpe = portfolio_return / portfolio_std
-        
-        results[0,i] = portfolio_return
-        results[1,i] = portfolio_std
-        results[2,i] = sharpe
+    if CUPY_AVAILABLE and num_portfolios >= GPU_FRONTIER_MIN_PORTFOLIOS:
+        weights_array, portfolio_returns, portfolio_std = _efficient_frontier_gpu(
+            mean_returns, cov_matrix, num_portfolios
+        )
+    elif NUMBA_AVAILABLE:
+        weights_array, portfolio_returns, portfolio_std = _efficient_frontier_kernel(
+            mean_returns, cov_matrix, num_portfolios
+        )
+    else:
+        weights_array = np.random.dirichlet(np.ones(num_assets), size=num_portfolios).astype(np.float32)
+        portfolio_returns = weights_array @ mean_returns
+        portfolio_std = np.sqrt(np.einsum('ij,jk,ik->i', weights_array, cov_matrix, weights_array))
+    
+    sharpe = portfolio_returns / portfolio_std
+    
+    results = np.stack([portfolio_returns, portfolio_std, sharpe])
     
     return results, weights_array
 
@@ -2174,18 +2375,28 @@ def calculate_efficient_frontier(prices, num_portfolios=100):
 # ANALYSIS FUNCTIONS
 # =============================================================================
 
-def calculate_portfolio_metrics(returns, benchmark_returns=None, risk_free_rate=0.02):
+def calculate_portfolio_metrics(returns, benchmark_returns=None, risk_free_rate=0.02, fields=None):
     """
     Calculate comprehensive portfolio metrics
+    
+    fields: optional collection of metric names to return; metrics that none of them
+    depend on (e.g. the drawdown pass for Max Drawdown/Calmar) are skipped.
     """
-    # Ensure returns are a pandas Series
+    def wanted(*names):
+        return fields is None or any(name in fields for name in names)
+    
+    # Ensure returns are a pandas Series or 1-D array
     if isinstance(returns, pd.DataFrame):
         returns = returns.iloc[:, 0]
+    elif not isinstance(returns, pd.Series):
+        returns = np.asarray(returns, dtype=np.float64)
+        if returns.ndim == 2:
+            returns = returns[:, 0]
     
     # Safety check: Handle empty returns
     if len(returns) == 0:
         st.error("⚠️ No data available to calculate metrics. Please check your date range - you may need a longer time period.")
-        return {
+        empty_metrics = {
             'Total Return': 0.0,
             'Annual Return': 0.0,
             'Annual Volatility': 0.0,
@@ -2195,49 +2406,73 @@ def calculate_portfolio_metrics(returns, benchmark_returns=None, risk_free_rate=
             'Calmar Ratio': 0.0,
             'Win Rate': 0.0
         }
+        return {k: v for k, v in empty_metrics.items() if wanted(k)}
     
     # Minimum data check (need at least 2 days for pct_change)
     if len(returns) < 2:
         st.warning(f"⚠️ Only {len(returns)} day(s) of data. Metrics may be unreliable. Recommend at least 30 days.")
     
+    # All metrics below run on one float64 array (NaNs skipped, as pandas would)
+    r = returns.to_numpy(dtype=np.float64) if isinstance(returns, pd.Series) else returns
+    valid = r[~np.isnan(r)]
+
+    # All-NaN input: same values the pandas reductions give for an empty selection
+    if valid.size == 0:
+        nan_metrics = {
+            'Total Return': 0.0,
+            'Annual Return': 0.0,
+            'Annual Volatility': np.nan,
+            'Sharpe Ratio': np.nan,
+            'Sortino Ratio': np.nan,
+            'Max Drawdown': np.nan,
+            'Calmar Ratio': np.nan,
+            'Win Rate': 0.0
+        }
+        return {k: v for k, v in nan_metrics.items() if wanted(k)}
+
+    growth = 1 + valid
+
     # Basic metrics
-    total_return = (1 + returns).prod() - 1
-    ann_return = (1 + total_return) ** (252 / len(returns)) - 1
-    ann_vol = returns.std() * np.sqrt(252)
+    total_return = np.prod(growth) - 1
+    ann_return = (1 + total_return) ** (252 / len(r)) - 1
+    ann_vol = np.std(valid, ddof=1) * np.sqrt(252)
     sharpe = (ann_return - risk_free_rate) / ann_vol if ann_vol != 0 else 0
     
-    # Downside metrics
-    downside_returns = returns[returns < 0]
-    downside_std = downside_returns.std() * np.sqrt(252)
-    sortino = (ann_return - risk_free_rate) / downside_std if downside_std != 0 else 0
-    
-    # Drawdown
-    cum_returns = (1 + returns).cumprod()
-    running_max = cum_returns.expanding().max()
-    drawdown = (cum_returns - running_max) / running_max
-    max_drawdown = drawdown.min()
-    
-    # Calmar ratio
-    calmar = ann_return / abs(max_drawdown) if max_drawdown != 0 else 0
-    
-    # Win rate
-    win_rate = (returns > 0).sum() / len(returns) if len(returns) > 0 else 0
-    
     metrics = {
         'Total Return': total_return,
         'Annual Return': ann_return,
         'Annual Volatility': ann_vol,
-        'Sharpe Ratio': sharpe,
-        'Sortino Ratio': sortino,
-        'Max Drawdown': max_drawdown,
-        'Calmar Ratio': calmar,
-        'Win Rate': win_rate
+        'Sharpe Ratio': sharpe
     }
     
+    # Downside metrics
+    if wanted('Sortino Ratio'):
+        downside_returns = valid[valid < 0]
+        downside_std = np.std(downside_returns, ddof=1) * np.sqrt(252)
+        metrics['Sortino Ratio'] = (ann_return - risk_free_rate) / downside_std if downside_std != 0 else 0
+    
+    # Drawdown
+    if wanted('Max Drawdown', 'Calmar Ratio'):
+        cum_returns = np.cumprod(growth)
+        running_max = np.maximum.accumulate(cum_returns)
+        max_drawdown = np.min(cum_returns / running_max - 1)
+        metrics['Max Drawdown'] = max_drawdown
+        
+        # Calmar ratio
+        metrics['Calmar Ratio'] = ann_return / abs(max_drawdown) if max_drawdown != 0 else 0
+    
+    # Win rate
+    if wanted('Win Rate'):
+        metrics['Win Rate'] = np.count_nonzero(valid > 0) / len(r)
+    
     # Alpha and Beta (if benchmark provided)
     if benchmark_returns is not None:
         if isinstance(benchmark_returns, pd.DataFrame):
             benchmark_returns = benchmark_returns.iloc[:, 0]
+        if not isinstance(returns, pd.Series):
+            # Plain arrays are aligned by position
+            returns = pd.Series(returns)
+            benchmark_returns = pd.Series(np.asarray(benchmark_returns, dtype=np.float64))
         
         # Align the series
         aligned_data = pd.DataFrame({
@@ -2261,7 +2496,202 @@ def calculate_portfolio_metrics(returns, benchmark_returns=None, risk_free_rate=
     return metrics
 
 
-def detect_market_regimes(returns, lookback=60):
+def calculate_cumulative_drawdown(returns, log_returns=None):
+    """
+    Cumulative growth, drawdown and max drawdown from one pass over returns
+    Growth is accumulated in log space (exp of cumsum of log1p) for numerical stability;
+    pass precomputed log_returns (np.log1p(returns)) to share them with other calculations.
+    Returns (cumulative, drawdown, max_drawdown) - arrays are NumPy, drawdown as a fraction
+    """
+    if log_returns is None:
+        log_returns = np.log1p(np.asarray(returns, dtype=np.float64))
+    
+    cumulative = np.exp(np.cumsum(log_returns))
+    drawdown = cumulative / np.maximum.accumulate(cumulative) - 1
+    max_drawdown = drawdown.min() if drawdown.size else 0.0
+    
+    return cumulative, drawdown, max_drawdown
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, nogil=True)
+    def _mean_negative_kernel(values):
+        """Sum and count of negative entries in one sweep"""
+        total = 0.0
+        count = 0
+        for v in values:
+            if v < 0:
+                total += v
+                count += 1
+        return total / count if count else 0.0
+
+
+def calculate_mean_negative(values):
+    """
+    Mean of the strictly negative entries (e.g. average drawdown), 0.0 if there are none
+    """
+    values = np.asarray(values, dtype=np.float64)
+    
+    if NUMBA_AVAILABLE:
+        return _mean_negative_kernel(values)
+    
+    negatives = np.minimum(values, 0.0)
+    count = np.count_nonzero(negatives)
+    return negatives.sum() / count if count else 0.0
+
+
+if NUMBA_AVAILABLE:
+    # fastmath without 'nnan': the NaN checks below must survive optimization
+    @njit(cache=True, fastmath={'nsz', 'arcp', 'contract', 'afn', 'reassoc'},
+          nogil=True, error_model='numpy')
+    def _rolling_ann_stats_1d(x, window, risk_free_rate, min_periods):
+        """Running sum / sum-of-squares sweep over one series; NaNs are skipped and counted"""
+        n = x.shape[0]
+        out = np.full((n, 3), np.nan)
+        s = 0.0
+        ss = 0.0
+        count = 0
+        for i in range(n):
+            v = x[i]
+            if not np.isnan(v):
+                s += v
+                ss += v * v
+                count += 1
+            if i >= window:
+                old = x[i - window]
+                if not np.isnan(old):
+                    s -= old
+                    ss -= old * old
+                    count -= 1
+            if count == 0:
+                # Drop any rounding residue once the window is empty
+                s = 0.0
+                ss = 0.0
+            if count >= min_periods and count > 0:
+                mean = s / count
+                ann_return = mean * 252
+                out[i, 0] = ann_return
+                if count > 1:
+                    var = max((ss - s * mean) / (count - 1), 0.0)
+                    ann_vol = np.sqrt(var * 252)
+                    out[i, 1] = ann_vol
+                    out[i, 2] = (ann_return - risk_free_rate) / ann_vol
+        return out
+
+    @njit(cache=True, nogil=True, parallel=True)
+    def _rolling_ann_stats_2d(x, window, risk_free_rate, min_periods):
+        """One series per row, rows processed in parallel"""
+        k, n = x.shape
+        out = np.empty((k, n, 3))
+        for j in prange(k):
+            out[j] = _rolling_ann_stats_1d(x[j], window, risk_free_rate, min_periods)
+        return out
+
+
+def _rolling_ann_stats_numpy(x, window, risk_free_rate, min_periods):
+    """NumPy fallback: windowed sums and valid counts from cumulative sums (x is one series per row)"""
+    k, n = x.shape
+    valid = ~np.isnan(x)
+    filled = np.where(valid, x, 0.0)
+    
+    zeros = np.zeros((k, 1))
+    csum = np.concatenate([zeros, np.cumsum(filled, axis=1)], axis=1)
+    csum_sq = np.concatenate([zeros, np.cumsum(filled * filled, axis=1)], axis=1)
+    ccount = np.concatenate([zeros, np.cumsum(valid, axis=1)], axis=1)
+    
+    # Window ending at i covers [max(i - window + 1, 0), i]
+    end = np.arange(1, n + 1)
+    start = np.maximum(end - window, 0)
+    s = csum[:, end] - csum[:, start]
+    ss = csum_sq[:, end] - csum_sq[:, start]
+    count = ccount[:, end] - ccount[:, start]
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = s / count
+        var = np.maximum((ss - s * mean) / (count - 1), 0.0)
+        ann_return = mean * 252
+        ann_vol = np.sqrt(var * 252)
+        sharpe = (ann_return - risk_free_rate) / ann_vol
+    
+    enough = (count >= min_periods) & (count > 0)
+    has_vol = enough & (count > 1)
+    out = np.full((k, n, 3), np.nan)
+    out[:, :, 0] = np.where(enough, ann_return, np.nan)
+    out[:, :, 1] = np.where(has_vol, ann_vol, np.nan)
+    out[:, :, 2] = np.where(has_vol, sharpe, np.nan)
+    return out
+
+
+def calculate_rolling_ann_stats(returns, window, risk_free_rate=0.02, min_periods=None):
+    """
+    Rolling annualized return, volatility and Sharpe ratio in a single windowed pass
+    
+    NaNs are skipped like pandas rolling: a window yields a value once it holds at
+    least min_periods valid observations (default: the full window), so a gap only
+    blanks the windows that contain it.
+    
+    Args:
+        returns: 1-D array (one series) or 2-D (T, K) array with one column per series
+        window: Rolling window length in days
+        risk_free_rate: Annual risk-free rate used for the Sharpe ratio
+        min_periods: Valid observations required per window (default: window)
+    
+    Returns:
+        Array of shape (T, 3) or (T, K, 3) holding [return, volatility, sharpe];
+        windows with too few valid observations are NaN
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    one_series = returns.ndim == 1
+    x = np.ascontiguousarray(returns[np.newaxis, :] if one_series else returns.T)
+    if min_periods is None:
+        min_periods = window
+    
+    if NUMBA_AVAILABLE:
+        out = _rolling_ann_stats_2d(x, window, risk_free_rate, min_periods)
+    else:
+        out = _rolling_ann_stats_numpy(x, window, risk_free_rate, min_periods)
+    
+    return out[0] if one_series else out.transpose(1, 0, 2)
+
+
+# Warm up the JIT kernels once at import (compiled artifacts are cached on disk via cache=True),
+# so the first chart interaction in a fresh session doesn't pay the compile
+if NUMBA_AVAILABLE:
+    _warmup = np.array([[0.01, -0.01, 0.02]])
+    _rolling_ann_stats_2d(_warmup, 2, 0.02, 2)
+    _mean_negative_kernel(_warmup[0])
+    _efficient_frontier_kernel(np.array([0.1], dtype=np.float32), np.array([[0.04]], dtype=np.float32), 1)
+    del _warmup
+
+
+# Indexed by return bucket * 2 + high-vol flag (see detect_market_regimes)
+_REGIME_BUCKET_LABELS = np.array([
+    'Bear Market (Low Vol)', 'Bear Market (High Vol)',
+    'Sideways/Choppy', 'Sideways/Choppy',
+    'Bull Market (Low Vol)', 'Bull Market (High Vol)'
+], dtype=object)
+
+
+def classify_market_regimes(rolling_returns, rolling_vol):
+    """
+    Label each day from its annualized rolling return and volatility
+    
+    Split out of detect_market_regimes so callers that maintain their own
+    rolling series (e.g. extended incrementally) can reuse the classification.
+    """
+    # Calculate percentiles for thresholds
+    vol_median = rolling_vol.median()
+    ann_return = rolling_returns.to_numpy()
+    
+    # Return bucket: 0 = below -2%, 1 = within +/-2% (or not yet defined), 2 = above 2% annualized
+    return_bucket = 1 + (ann_return > 0.02).astype(np.int8) - (ann_return < -0.02).astype(np.int8)
+    vol_high = (rolling_vol.to_numpy() > vol_median).astype(np.int8)
+    
+    # Classify regimes: label lookup on bucket * 2 + vol_high, no per-regime masking
+    return pd.Series(_REGIME_BUCKET_LABELS[return_bucket * 2 + vol_high], index=rolling_returns.index, dtype='object')
+
+
+def detect_market_regimes(returns, lookback=60, return_rolling=False):
     """
     Detect market regimes based on volatility and returns
     
@@ -2271,6 +2701,9 @@ def detect_market_regimes(returns, lookback=60):
     3. Sideways/Choppy - Returns near zero, any volatility
     4. Bear Market (Low Vol) - Negative returns, low volatility
     5. Bear Market (High Vol) - Negative returns, high volatility (crisis)
+    
+    With return_rolling=True, also returns the annualized rolling return and
+    volatility used for the classification as (regimes, rolling_returns, rolling_vol).
     """
     # Ensure returns is a Series
     if isinstance(returns, pd.DataFrame):
@@ -2280,24 +2713,10 @@ def detect_market_regimes(returns, lookback=60):
     rolling_returns = returns.rolling(lookback).mean() * 252  # Annualized
     rolling_vol = returns.rolling(lookback).std() * np.sqrt(252)  # Annualized
     
-    # Calculate percentiles for thresholds
-    vol_median = rolling_vol.median()
-    return_positive = rolling_returns > 0.02  # Above 2% annualized
-    return_negative = rolling_returns < -0.02  # Below -2% annualized
-    vol_high = rolling_vol > vol_median
-    
-    # Classify regimes
-    regimes = pd.Series(index=returns.index, dtype='object')
-    regimes[:] = 'Sideways/Choppy'  # Default
-    
-    # Bull markets
-    regimes[return_positive & ~vol_high] = 'Bull Market (Low Vol)'
-    regimes[return_positive & vol_high] = 'Bull Market (High Vol)'
-    
-    # Bear markets
-    regimes[return_negative & ~vol_high] = 'Bear Market (Low Vol)'
-    regimes[return_negative & vol_high] = 'Bear Market (High Vol)'
+    regimes = classify_market_regimes(rolling_returns, rolling_vol)
     
+    if return_rolling:
+        return regimes, rolling_returns, rolling_vol
     return regimes
 
 
@@ -2305,79 +2724,252 @@ def analyze_regime_performance(returns, regimes):
     """
     Analyze portfolio performance by market regime
     """
-    df = pd.DataFrame({'returns': returns, 'regime': regimes})
-    
-    regime_stats = []
-    for regime in df['regime'].unique():
-        regime_returns = df[df['regime'] == regime]['returns']
+    # One grouped pass (first-seen regime order) instead of a filtered copy per regime
+    grouped = returns.groupby(regimes, sort=False)
+    
+    regime_stats = pd.DataFrame({
+        'Occurrences': grouped.size(),
+        'Avg Daily Return': grouped.mean(),
+        'Volatility': grouped.std() * np.sqrt(252),
+        'Best Day': grouped.max(),
+        'Worst Day': grouped.min(),
+        'Win Rate': (returns > 0).groupby(regimes, sort=False).mean()
+    })
+    
+    return regime_stats.rename_axis('Regime').reset_index()
+
+
+if NUMBA_AVAILABLE:
+    # Explicit signature: compiled eagerly at import and loaded from the on-disk cache
+    # afterwards, so the first Monte Carlo render does not pay the JIT
+    @njit('Tuple((float32[:], float32[:,:]))'
+          '(float32, float32, int64, int64, float64[:], boolean)',
+          cache=True, fastmath=True, nogil=True, boundscheck=False)
+    def _monte_carlo_summary_kernel(mu, sigma, days, nsim, q, log_returns):
+        """Day-by-day path stepping with per-day percentile bands"""
+        level = np.ones(nsim, dtype=np.float32)
+        log_level = np.zeros(nsim, dtype=np.float32)
+        bands = np.empty((q.shape[0], days), dtype=np.float32)
+        growth = np.float32(1.0) + mu
         
-        if len(regime_returns) > 0:
-            stats = {
-                'Regime': regime,
-                'Occurrences': len(regime_returns),
-                'Avg Daily Return': regime_returns.mean(),
-                'Volatility': regime_returns.std() * np.sqrt(252),
-                'Best Day': regime_returns.max(),
-                'Worst Day': regime_returns.min(),
-                'Win Rate': (regime_returns > 0).sum() / len(regime_returns)
-            }
-            regime_stats.append(stats)
-    
-    return pd.DataFrame(regime_stats)
+        for d in range(days):
+            if log_returns:
+                for j in range(nsim):
+                    log_level[j] += mu + sigma * np.float32(np.random.standard_normal())
+                    level[j] = np.exp(log_level[j])
+            else:
+                for j in range(nsim):
+                    level[j] *= growth + sigma * np.float32(np.random.standard_normal())
+            
+            # Linear-interpolated percentiles (numpy default) from one sort of the day's values
+            ordered = np.sort(level)
+            for k in range(q.shape[0]):
+                pos = q[k] / 100.0 * (nsim - 1)
+                lo = int(np.floor(pos))
+                hi = min(lo + 1, nsim - 1)
+                bands[k, d] = ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+        
+        return level, bands
 
 
-def monte_carlo_simulation(returns, days_forward=252, num_simulations=1000):
-    """
-    Run Monte Carlo simulation for forward-looking risk analysis
+# Days of paths generated per block by the NumPy Monte Carlo fallback
+_MONTE_CARLO_CHUNK_DAYS = 128
+
+
+def simulate_monte_carlo_summary(returns, days_forward=252, num_simulations=1000,
+                                 mean_return=None, std_return=None,
+                                 percentiles=(5, 25, 50, 75, 95), log_returns=False):
     """
-    # Ensure returns is a Series
-    if isinstance(returns, pd.DataFrame):
-        returns = returns.iloc[:, 0]
+    Monte Carlo simulation reduced on the fly to what the charts and scenario tables use
     
-    # Calculate parameters from historical returns
-    mean_return = returns.mean()
-    std_return = returns.std()
+    With numba the paths are stepped one day at a time in a compiled kernel. Otherwise paths
+    are generated a block of days at a time, so only one (block days, num_simulations) array
+    is alive instead of the full path matrix. log_returns=True draws normal log returns
+    (mean/std of log1p(returns)) and builds the paths as exp(cumsum) instead of compounding
+    normal simple returns.
     
-    # Run simulations
-    last_price = 1.0  # Normalized starting point
-    simulations = np.zeros((days_forward, num_simulations))
-    
-    for i in range(num_simulations):
-        daily_returns = np.random.normal(mean_return, std_return, days_forward)
-        price_path = last_price * (1 + daily_returns).cumprod()
-        simulations[:, i] = price_path
+    Returns:
+        final_values: Last-day value of every simulation
+        bands: (len(percentiles), days_forward) per-day percentile paths
+    """
+    if mean_return is None or std_return is None:
+        if isinstance(returns, pd.DataFrame):
+            returns = returns.iloc[:, 0]
+        values = np.asarray(returns, dtype=np.float64)
+        if log_returns:
+            values = np.log1p(values)
+        mean_return = np.nanmean(values)
+        std_return = np.nanstd(values, ddof=1)
+    
+    mean_return = np.float32(mean_return)
+    std_return = np.float32(std_return)
+    
+    if NUMBA_AVAILABLE and num_simulations > 0:
+        return _monte_carlo_summary_kernel(
+            mean_return, std_return, days_forward, num_simulations,
+            np.asarray(percentiles, dtype=np.float64), log_returns
+        )
     
-    return simulations
+    chunk_days = _MONTE_CARLO_CHUNK_DAYS
+    rng = np.random.default_rng()
+    level = np.ones(num_simulations, dtype=np.float32)
+    log_level = np.zeros(num_simulations, dtype=np.float32)
+    bands = np.empty((len(percentiles), days_forward), dtype=np.float32)
+    block = np.empty((min(chunk_days, days_forward), num_simulations), dtype=np.float32)
+    
+    for start in range(0, days_forward, chunk_days):
+        stop = min(start + chunk_days, days_forward)
+        chunk = block[:stop - start]
+        rng.standard_normal(chunk.shape, dtype=np.float32, out=chunk)
+        chunk *= std_return
+        if log_returns:
+            # Carry the running log level across chunks, then exponentiate in place
+            chunk += mean_return
+            np.cumsum(chunk, axis=0, out=chunk)
+            chunk += log_level
+            log_level[:] = chunk[-1]
+            np.exp(chunk, out=chunk)
+        else:
+            chunk += 1 + mean_return
+            np.cumprod(chunk, axis=0, out=chunk)
+            chunk *= level
+        
+        bands[:, start:stop] = np.percentile(chunk, percentiles, axis=1)
+        level[:] = chunk[-1]
+    
+    return level, bands
+
+
+def _quantile_ranks(n, q):
+    """Order-statistic ranks and weight for a linear-interpolated quantile (numpy/pandas default)"""
+    pos = q * (n - 1)
+    lo = int(np.floor(pos))
+    return lo, min(lo + 1, n - 1), pos - lo
+
+
+def _tail_quantiles(values):
+    """5% and 1% quantiles via one np.partition on the four ranks involved (no full sort)"""
+    lo_95, hi_95, w_95 = _quantile_ranks(values.size, 0.05)
+    lo_99, hi_99, w_99 = _quantile_ranks(values.size, 0.01)
+    part = np.partition(values, [lo_99, hi_99, lo_95, hi_95])
+    var_95 = part[lo_95] + (part[hi_95] - part[lo_95]) * w_95
+    var_99 = part[lo_99] + (part[hi_99] - part[lo_99]) * w_99
+    return var_95, var_99
+
+
+if NUMBA_AVAILABLE:
+    _quantile_ranks_jit = njit(cache=True)(_quantile_ranks)
+    
+    @njit(cache=True, fastmath=True, nogil=True)
+    def _forward_stats_kernel(r):
+        """Mean, std (ddof=1), VaR/CVaR at 95/99% and number of losing days"""
+        n = r.shape[0]
+        total = 0.0
+        losses = 0
+        for v in r:
+            total += v
+            if v < 0:
+                losses += 1
+        mean = total / n
+        
+        sq = 0.0
+        for v in r:
+            sq += (v - mean) * (v - mean)
+        std = np.sqrt(sq / (n - 1))
+        
+        # Tail: partition on the four order statistics the two quantiles need
+        lo_95, hi_95, w_95 = _quantile_ranks_jit(n, 0.05)
+        lo_99, hi_99, w_99 = _quantile_ranks_jit(n, 0.01)
+        part = np.partition(r, np.array([lo_99, hi_99, lo_95, hi_95]))
+        var_95 = part[lo_95] + (part[hi_95] - part[lo_95]) * w_95
+        var_99 = part[lo_99] + (part[hi_99] - part[lo_99]) * w_99
+        
+        # CVaR: mean of the days at or below each cut-off, one pass
+        tail_95 = 0.0
+        tail_99 = 0.0
+        n_95 = 0
+        n_99 = 0
+        for v in r:
+            if v <= var_95:
+                tail_95 += v
+                n_95 += 1
+                if v <= var_99:
+                    tail_99 += v
+                    n_99 += 1
+        cvar_95 = tail_95 / n_95 if n_95 else np.nan
+        cvar_99 = tail_99 / n_99 if n_99 else np.nan
+        
+        return mean, std, var_95, var_99, cvar_95, cvar_99, losses
+    
+    @njit(cache=True, nogil=True)
+    def _max_drawdown_kernel(r):
+        """Single scan: compound wealth, track the running peak and the deepest drop"""
+        wealth = 1.0
+        peak = 0.0
+        max_dd = 0.0
+        for v in r:
+            wealth *= 1.0 + v
+            peak = max(peak, wealth)
+            max_dd = min(max_dd, wealth / peak - 1.0)
+        return max_dd
+
+
+_FORWARD_RISK_KEYS = (
+    'Expected Annual Return', 'Expected Volatility', 'VaR (95%)', 'VaR (99%)',
+    'CVaR (95%)', 'CVaR (99%)', 'Probability of Daily Loss', 'Estimated Max Drawdown'
+)
 
 
 def calculate_forward_risk_metrics(returns, confidence_level=0.95):
     """
     Calculate forward-looking risk metrics
+    
+    returns may be a Series/DataFrame or a 1-D ndarray of daily returns. NaNs are dropped
+    from every statistic, except that Probability of Daily Loss still divides by the full
+    number of days (NaNs included), as the pandas version did.
     """
     # Ensure returns is a Series
     if isinstance(returns, pd.DataFrame):
         returns = returns.iloc[:, 0]
     
-    # Expected return and volatility
-    expected_return = returns.mean() * 252
-    expected_vol = returns.std() * np.sqrt(252)
+    values = np.asarray(returns, dtype=np.float64)
+    num_days = values.size
+    values = values[~np.isnan(values)]
     
-    # Value at Risk (VaR)
-    var_95 = returns.quantile(1 - 0.95)
-    var_99 = returns.quantile(1 - 0.99)
+    # Volatility and tail quantiles need at least two observations
+    if values.size < 2:
+        return dict.fromkeys(_FORWARD_RISK_KEYS, np.nan)
     
-    # Conditional VaR (CVaR / Expected Shortfall)
-    cvar_95 = returns[returns <= var_95].mean()
-    cvar_99 = returns[returns <= var_99].mean()
+    if NUMBA_AVAILABLE:
+        # Mean, volatility, VaR/CVaR (95/99) and losing-day count from one sorted sweep
+        (mean_return, std_return, var_95, var_99,
+         cvar_95, cvar_99, num_losses) = _forward_stats_kernel(values)
+    else:
+        mean_return = values.mean()
+        std_return = values.std(ddof=1)
+        
+        # Value at Risk (VaR)
+        var_95, var_99 = _tail_quantiles(values)
+        
+        # Conditional VaR (CVaR / Expected Shortfall)
+        cvar_95 = values[values <= var_95].mean()
+        cvar_99 = values[values <= var_99].mean()
+        
+        # Losing days
+        num_losses = np.count_nonzero(values < 0)
     
     # Probability of daily loss
-    prob_loss = (returns < 0).sum() / len(returns)
+    prob_loss = num_losses / num_days
+    
+    # Expected return and volatility
+    expected_return = mean_return * 252
+    expected_vol = std_return * np.sqrt(252)
     
     # Estimated maximum drawdown (based on historical)
-    cum_returns = (1 + returns).cumprod()
-    running_max = cum_returns.expanding().max()
-    drawdowns = (cum_returns - running_max) / running_max
-    estimated_max_dd = drawdowns.min()
+    if NUMBA_AVAILABLE:
+        estimated_max_dd = _max_drawdown_kernel(values)
+    else:
+        estimated_max_dd = calculate_cumulative_drawdown(values)[2]
     
     return {
         'Expected Annual Return': expected_return,
@@ -2395,6 +2987,53 @@ def calculate_forward_risk_metrics(returns, confidence_level=0.95):
 # VISUALIZATION FUNCTIONS
 # =============================================================================
 
+def _lttb_indices(x, y, n_out):
+    """Largest-Triangle-Three-Buckets: index of the most visually significant point per bucket"""
+    n = x.shape[0]
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0] = 0
+    idx[n_out - 1] = n - 1
+    every = (n - 2) / (n_out - 2)
+    a = 0
+    
+    for i in range(n_out - 2):
+        start = int(np.floor(i * every)) + 1
+        end = int(np.floor((i + 1) * every)) + 1
+        next_end = min(max(int(np.floor((i + 2) * every)) + 1, end + 1), n)
+        
+        # Average of the next bucket is the third triangle vertex
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        idx[i + 1] = a
+    
+    return idx
+
+
+if NUMBA_AVAILABLE:
+    _lttb_indices_jit = njit(cache=True, nogil=True)(_lttb_indices)
+
+
+def lttb_downsample(x, y, n_out=2000):
+    """
+    Indices of an LTTB-downsampled line (first and last points always kept)
+    
+    x must be increasing (e.g. int64 epoch values or positions) and y free of NaNs;
+    series already at or below n_out points come back whole.
+    """
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    y = np.ascontiguousarray(y, dtype=np.float64)
+    n = x.shape[0]
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    
+    if NUMBA_AVAILABLE:
+        return _lttb_indices_jit(x, y, n_out)
+    return _lttb_indices(x, y, n_out)
+
+
 def plot_cumulative_returns(returns, title='Cumulative Returns', benchmark_returns=None):
     """
     Plot cumulative returns over time with enhanced styling
@@ -2562,27 +3201,34 @@ def plot_regime_chart(regimes, returns):
         'Bear Market (High Vol)': '#ff4444'      # Bright red
     }
     
-    # Calculate cumulative returns and rolling volatility
-    cum_returns = (1 + returns).cumprod()
-    rolling_vol = returns.rolling(60).std() * np.sqrt(252) * 100  # Annualized, as percentage
+    # Calculate cumulative returns and rolling volatility on the raw arrays
+    dates = returns.index
+    values = returns.to_numpy(dtype=np.float64)
+    # Accumulate in float64, then hand matplotlib float32 copies (display precision only)
+    cum_returns = np.cumprod(1 + values).astype(np.float32)
+    rolling_vol = (calculate_rolling_ann_stats(values, 60)[:, 1] * 100).astype(np.float32)  # Annualized, as percentage
     
     # Get the full Y-axis range for returns
     y_min = cum_returns.min() * 0.95
     y_max = cum_returns.max() * 1.05
     
     # Plot regime backgrounds FIRST (behind everything) - FULL HEIGHT
+    # Run-length encode the labels so each contiguous regime is one span
+    labels = np.asarray(regimes, dtype=object)
+    starts = np.flatnonzero(np.r_[True, labels[1:] != labels[:-1]])
+    ends = np.r_[starts[1:], len(labels) - 1]
     regimes_present = set()
-    for regime, color in regime_colors.items():
-        mask = regimes == regime
-        if mask.any():
-            regimes_present.add(regime)
-            # Fill from bottom to top of the ENTIRE chart
-            ax1.fill_between(returns.index, y_min, y_max, 
-                           where=mask, alpha=0.25, color=color,
-                           zorder=1)  # Behind everything
+    for start, end in zip(starts, ends):
+        color = regime_colors.get(labels[start])
+        if color is None:
+            continue
+        regimes_present.add(labels[start])
+        # Fill from bottom to top of the ENTIRE chart, up to where the next regime begins
+        ax1.axvspan(dates[start], dates[end], alpha=0.25, color=color,
+                    linewidth=0, zorder=1)  # Behind everything
     
     # Plot cumulative returns (LEFT Y-AXIS)
-    line1 = ax1.plot(cum_returns.index, cum_returns.values, linewidth=3, 
+    line1 = ax1.plot(dates, cum_returns, linewidth=3, 
                      color='#000000', label='Portfolio Value', zorder=10)
     
     ax1.set_ylabel('Cumulative Return', fontsize=13, fontweight='bold', color='#000000')
@@ -2594,7 +3240,7 @@ def plot_regime_chart(regimes, returns):
     
     # Create second Y-axis for VOLATILITY (RIGHT Y-AXIS)
     ax2 = ax1.twinx()
-    line2 = ax2.plot(rolling_vol.index, rolling_vol.values, linewidth=2.5,
+    line2 = ax2.plot(dates, rolling_vol, linewidth=2.5,
                      color='#dc3545', label='Rolling Volatility (60d)', 
                      linestyle='--', alpha=0.8, zorder=9)
     
@@ -2630,39 +3276,68 @@ def plot_regime_chart(regimes, returns):
     return fig
 
 
-def plot_monte_carlo_simulation(simulations, title='Monte Carlo Simulation - 1 Year Forward'):
-    """
-    Plot Monte Carlo simulation results
-    """
-    fig, ax = plt.subplots(figsize=(14, 8))
-    
-    # Plot individual simulations (subset for performance)
-    num_to_plot = min(100, simulations.shape[1])
-    for i in range(0, num_to_plot):
-        ax.plot(simulations[:, i], color='#667eea', alpha=0.1, linewidth=0.5)
-    
-    # Calculate and plot percentiles
-    percentiles = [5, 25, 50, 75, 95]
-    percentile_values = np.percentile(simulations, percentiles, axis=1)
-    
-    colors = ['#dc3545', '#fd7e14', '#28a745', '#17a2b8', '#6c757d']
-    labels = ['5th %ile (Worst Case)', '25th %ile', '50th %ile (Median)', 
-              '75th %ile', '95th %ile (Best Case)']
-    
-    for i, (pct, color, label) in enumerate(zip(percentile_values, colors, labels)):
-        ax.plot(pct, color=color, linewidth=2.5, label=label, alpha=0.9)
-    
-    ax.axhline(y=1.0, color='black', linestyle='--', linewidth=1, alpha=0.5, label='Starting Value')
-    
-    ax.set_title(title, fontsize=16, fontweight='bold', pad=20)
-    ax.set_xlabel('Trading Days Forward', fontsize=12, fontweight='bold')
-    ax.set_ylabel('Portfolio Value (Normalized)', fontsize=12, fontweight='bold')
-    ax.legend(loc='best', frameon=True, shadow=True, fontsize=10)
-    ax.grid(True, alpha=0.3, linestyle='--')
-    ax.set_facecolor('#f8f9fa')
-    fig.patch.set_facecolor('white')
+def plot_monte_carlo_fan(bands, title='Monte Carlo Simulation - 1 Year Forward'):
+    """
+    Plotly fan chart of Monte Carlo percentile bands
+    
+    bands: 5/25/50/75/95 percentile paths, shape (5, days) (see simulate_monte_carlo_summary).
+    Draws five traces with the 5-95 and 25-75 ranges shaded, instead of one line per path.
+    """
+    p5, p25, p50, p75, p95 = bands
+    x = np.arange(bands.shape[1])
+    
+    fig = go.Figure()
+    
+    # Outer 5-95 band
+    fig.add_trace(go.Scatter(
+        x=x, y=p5, name='5th %ile (Worst Case)',
+        line=dict(color='#dc3545', width=2),
+        hovertemplate='%{y:.3f}<extra></extra>'
+    ))
+    fig.add_trace(go.Scatter(
+        x=x, y=p95, name='95th %ile (Best Case)', fill='tonexty',
+        line=dict(color='#6c757d', width=2),
+        fillcolor='rgba(102, 126, 234, 0.15)',
+        hovertemplate='%{y:.3f}<extra></extra>'
+    ))
+    
+    # Inner 25-75 band
+    fig.add_trace(go.Scatter(
+        x=x, y=p25, name='25th %ile',
+        line=dict(color='#fd7e14', width=2),
+        hovertemplate='%{y:.3f}<extra></extra>'
+    ))
+    fig.add_trace(go.Scatter(
+        x=x, y=p75, name='75th %ile', fill='tonexty',
+        line=dict(color='#17a2b8', width=2),
+        fillcolor='rgba(102, 126, 234, 0.35)',
+        hovertemplate='%{y:.3f}<extra></extra>'
+    ))
+    
+    fig.add_trace(go.Scatter(
+        x=x, y=p50, name='50th %ile (Median)',
+        line=dict(color='#28a745', width=3),
+        hovertemplate='%{y:.3f}<extra></extra>'
+    ))
+    
+    fig.add_hline(y=1.0, line=dict(color='black', dash='dash', width=1), opacity=0.5)
+    
+    fig.update_layout(
+        title=title,
+        xaxis_title='Trading Days Forward',
+        yaxis_title='Portfolio Value (Normalized)',
+        hovermode='x unified',
+        height=550,
+        template='plotly_white',
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        )
+    )
     
-    plt.tight_layout()
     return fig
 
 
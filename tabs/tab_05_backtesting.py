@@ -6,12 +6,216 @@ Comprehensive comparison of portfolio performance against selected benchmarks
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.graph_objects as go
-import matplotlib.pyplot as plt
 from datetime import datetime
 from helper_functions import *
 
 
+@st.cache_data(show_spinner=False)
+def _cached_portfolio_metrics(returns_bytes):
+    """Portfolio metrics keyed on the raw float64 bytes of a returns series"""
+    return calculate_portfolio_metrics(pd.Series(np.frombuffer(returns_bytes, dtype=np.float64)))
+
+
+@st.cache_data(show_spinner=False)
+def _align_returns(portfolio_returns, benchmark_returns):
+    """Restrict two return series to their common dates"""
+    p_idx = portfolio_returns.index
+    b_idx = benchmark_returns.index
+    
+    if (p_idx.is_monotonic_increasing and b_idx.is_monotonic_increasing
+            and p_idx.is_unique and b_idx.is_unique):
+        # Sorted trading-day indices: positional gather instead of label lookup
+        common = np.intersect1d(p_idx.values, b_idx.values, assume_unique=True)
+        p_pos = np.searchsorted(p_idx.values, common)
+        b_pos = np.searchsorted(b_idx.values, common)
+        return portfolio_returns.iloc[p_pos], benchmark_returns.iloc[b_pos]
+    
+    common_dates = p_idx.intersection(b_idx)
+    return portfolio_returns.loc[common_dates], benchmark_returns.loc[common_dates]
+
+
+def _to_epoch_ms(dates):
+    """DatetimeIndex -> int64 milliseconds since epoch (Plotly reads these as dates)"""
+    return dates.values.astype('datetime64[ms]').astype(np.int64)
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _build_cumulative_figure(dates_ms_bytes, portfolio_bytes, benchmark_bytes, benchmark_name):
+    """Cumulative returns chart (WebGL), reused across reruns with identical data"""
+    import plotly.graph_objects as go
+    x = np.frombuffer(dates_ms_bytes, dtype=np.int64)
+    
+    fig = go.Figure()
+    
+    fig.add_trace(go.Scattergl(
+        x=x,
+        y=np.frombuffer(portfolio_bytes, dtype=np.float32),
+        name='Your Portfolio',
+        line=dict(color='#667eea', width=3),
+        hovertemplate='%{y:.2f}%<extra></extra>'
+    ))
+    
+    fig.add_trace(go.Scattergl(
+        x=x,
+        y=np.frombuffer(benchmark_bytes, dtype=np.float32),
+        name=benchmark_name,
+        line=dict(color='#f5576c', width=3, dash='dash'),
+        hovertemplate='%{y:.2f}%<extra></extra>'
+    ))
+    
+    fig.update_layout(
+        title=f"Cumulative Returns Comparison",
+        xaxis_title="Date",
+        xaxis_type='date',
+        yaxis_title="Cumulative Return (%)",
+        hovermode='x unified',
+        height=500,
+        template='plotly_white',
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        )
+    )
+    
+    return fig
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _build_drawdown_figure(dates_ms_bytes, portfolio_bytes, benchmark_bytes, benchmark_name):
+    """Drawdown comparison chart (WebGL), reused across reruns with identical data"""
+    import plotly.graph_objects as go
+    x = np.frombuffer(dates_ms_bytes, dtype=np.int64)
+    
+    fig = go.Figure()
+    
+    fig.add_trace(go.Scattergl(
+        x=x,
+        y=np.frombuffer(portfolio_bytes, dtype=np.float32),
+        name='Your Portfolio',
+        fill='tozeroy',
+        line=dict(color='#667eea', width=2),
+        fillcolor='rgba(102, 126, 234, 0.3)',
+        hovertemplate='%{y:.2f}%<extra></extra>'
+    ))
+    
+    fig.add_trace(go.Scattergl(
+        x=x,
+        y=np.frombuffer(benchmark_bytes, dtype=np.float32),
+        name=benchmark_name,
+        line=dict(color='#f5576c', width=2, dash='dash'),
+        hovertemplate='%{y:.2f}%<extra></extra>'
+    ))
+    
+    fig.update_layout(
+        title="Drawdown Comparison (Lower is Better Risk Management)",
+        xaxis_title="Date",
+        xaxis_type='date',
+        yaxis_title="Drawdown (%)",
+        hovermode='x unified',
+        height=500,
+        template='plotly_white',
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        )
+    )
+    
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def _rolling_stats(returns_bytes, window):
+    """
+    Rolling annualized return, volatility and Sharpe for a (T, 2) portfolio/benchmark matrix
+    Keyed on the raw float64 bytes so slider moves only recompute on a cache miss
+    """
+    returns = np.frombuffer(returns_bytes, dtype=np.float64).reshape(-1, 2)
+    return calculate_rolling_ann_stats(returns, window)
+
+
+@st.fragment
+def _render_rolling_metrics(portfolio_returns_aligned, benchmark_returns_aligned, benchmark_name):
+    """Rolling metrics section - a fragment, so the window slider only reruns this block"""
+    import plotly.graph_objects as go
+    
+    window = st.slider("Select Rolling Window (days)", 30, 365, 90, key="rolling_window_backtest")
+    
+    # Calculate rolling metrics (cached per window and returns content) - both series in one pass
+    dates = portfolio_returns_aligned.index
+    returns_matrix = np.column_stack([
+        portfolio_returns_aligned.to_numpy(dtype=np.float64),
+        benchmark_returns_aligned.to_numpy(dtype=np.float64)
+    ])
+    rolling = _rolling_stats(returns_matrix.tobytes(), window)
+    
+    portfolio_rolling_return = rolling[:, 0, 0] * 100
+    benchmark_rolling_return = rolling[:, 1, 0] * 100
+    portfolio_rolling_sharpe = rolling[:, 0, 2]
+    benchmark_rolling_sharpe = rolling[:, 1, 2]
+    
+    # Plot rolling returns
+    fig = go.Figure()
+    
+    fig.add_trace(go.Scatter(
+        x=dates,
+        y=portfolio_rolling_return.astype(np.float32),
+        name='Your Portfolio',
+        line=dict(color='#667eea', width=2),
+    ))
+    
+    fig.add_trace(go.Scatter(
+        x=dates,
+        y=benchmark_rolling_return.astype(np.float32),
+        name=benchmark_name,
+        line=dict(color='#f5576c', width=2, dash='dash'),
+    ))
+    
+    fig.update_layout(
+        title=f"{window}-Day Rolling Annualized Return",
+        xaxis_title="Date",
+        yaxis_title="Annualized Return (%)",
+        hovermode='x unified',
+        height=400,
+        template='plotly_white'
+    )
+    
+    st.plotly_chart(fig, use_container_width=True)
+    
+    # Plot rolling Sharpe
+    fig = go.Figure()
+    
+    fig.add_trace(go.Scatter(
+        x=dates,
+        y=portfolio_rolling_sharpe.astype(np.float32),
+        name='Your Portfolio',
+        line=dict(color='#667eea', width=2),
+    ))
+    
+    fig.add_trace(go.Scatter(
+        x=dates,
+        y=benchmark_rolling_sharpe.astype(np.float32),
+        name=benchmark_name,
+        line=dict(color='#f5576c', width=2, dash='dash'),
+    ))
+    
+    fig.update_layout(
+        title=f"{window}-Day Rolling Sharpe Ratio",
+        xaxis_title="Date",
+        yaxis_title="Sharpe Ratio",
+        hovermode='x unified',
+        height=400,
+        template='plotly_white'
+    )
+    
+    st.plotly_chart(fig, use_container_width=True)
+
+
 def render(tab5, portfolio_returns, prices, weights, tickers, metrics, current):
     """Render the Backtesting tab with benchmark comparison"""
     
@@ -58,35 +262,47 @@ def render(tab5, portfolio_returns, prices, weights, tickers, metrics, current):
         
         st.markdown("---")
         
-        # Download benchmark data
-        with st.spinner(f"Loading {benchmark_name} data..."):
-            start_date = current['start_date']
-            end_date = current['end_date']
-            
-            if benchmark_ticker == "6040":
-                # Create 60/40 portfolio
-                benchmark_data = download_ticker_data(['SPY', 'AGG'], start_date, end_date)
-                if benchmark_data is not None and not benchmark_data.empty:
-                    benchmark_weights = np.array([0.6, 0.4])
-                    benchmark_returns = calculate_portfolio_returns(benchmark_data, benchmark_weights)
-                else:
-                    st.error("Failed to load benchmark data")
-                    st.stop()
-            else:
-                benchmark_data = download_ticker_data([benchmark_ticker], start_date, end_date)
-                if benchmark_data is not None and not benchmark_data.empty:
-                    benchmark_returns = benchmark_data[benchmark_ticker].pct_change().dropna()
+        # Download benchmark data - skipped when only chart widgets changed since the last run
+        start_date = current['start_date']
+        end_date = current['end_date']
+        bench_sig = (benchmark_ticker, start_date, end_date, hash(portfolio_returns.to_numpy().tobytes()))
+        
+        if st.session_state.get('_backtest_bench_sig') == bench_sig and '_backtest_bench_cache' in st.session_state:
+            benchmark_metrics, portfolio_returns_aligned, benchmark_returns_aligned = \
+                st.session_state['_backtest_bench_cache']
+        else:
+            with st.spinner(f"Loading {benchmark_name} data..."):
+                if benchmark_ticker == "6040":
+                    # Create 60/40 portfolio
+                    benchmark_data = download_ticker_data(['SPY', 'AGG'], start_date, end_date)
+                    if benchmark_data is not None and not benchmark_data.empty:
+                        benchmark_weights = np.array([0.6, 0.4])
+                        benchmark_returns = calculate_portfolio_returns(benchmark_data, benchmark_weights)
+                    else:
+                        st.error("Failed to load benchmark data")
+                        st.stop()
                 else:
-                    st.error("Failed to load benchmark data")
-                    st.stop()
-            
-            # Align the returns
-            common_dates = portfolio_returns.index.intersection(benchmark_returns.index)
-            portfolio_returns_aligned = portfolio_returns.loc[common_dates]
-            benchmark_returns_aligned = benchmark_returns.loc[common_dates]
+                    benchmark_data = download_ticker_data([benchmark_ticker], start_date, end_date)
+                    if benchmark_data is not None and not benchmark_data.empty:
+                        benchmark_returns = benchmark_data[benchmark_ticker].pct_change().dropna()
+                    else:
+                        st.error("Failed to load benchmark data")
+                        st.stop()
+                
+                # Align the returns
+                portfolio_returns_aligned, benchmark_returns_aligned = _align_returns(
+                    portfolio_returns, benchmark_returns
+                )
+                
+                # Calculate benchmark metrics
+                benchmark_metrics = _cached_portfolio_metrics(
+                    benchmark_returns_aligned.to_numpy(dtype=np.float64).tobytes()
+                )
             
-            # Calculate benchmark metrics
-            benchmark_metrics = calculate_portfolio_metrics(benchmark_returns_aligned)
+            st.session_state['_backtest_bench_sig'] = bench_sig
+            st.session_state['_backtest_bench_cache'] = (
+                benchmark_metrics, portfolio_returns_aligned, benchmark_returns_aligned
+            )
         
         # =============================================================================
         # HEAD-TO-HEAD COMPARISON
@@ -128,7 +344,7 @@ def render(tab5, portfolio_returns, prices, weights, tickers, metrics, current):
         # Correlation
         correlation = portfolio_returns_aligned.corr(benchmark_returns_aligned)
         
-        # Create comparison table
+        # Create comparison table (numeric - display formatting is left to the Styler)
         comparison_df = pd.DataFrame({
             'Metric': [
                 'Total Return',
@@ -143,62 +359,70 @@ def render(tab5, portfolio_returns, prices, weights, tickers, metrics, current):
                 'Correlation'
             ],
             'Your Portfolio': [
-                f"{portfolio_total_return*100:.2f}%",
-                f"{portfolio_cagr*100:.2f}%",
-                f"{portfolio_vol*100:.2f}%",
-                f"{portfolio_sharpe:.2f}",
-                f"{portfolio_sortino:.2f}",
-                f"{portfolio_max_dd*100:.2f}%",
-                f"{portfolio_calmar:.2f}",
-                f"{alpha_annual*100:.2f}%",
-                f"{beta:.2f}",
-                f"{correlation:.2f}"
+                portfolio_total_return * 100,
+                portfolio_cagr * 100,
+                portfolio_vol * 100,
+                portfolio_sharpe,
+                portfolio_sortino,
+                portfolio_max_dd * 100,
+                portfolio_calmar,
+                alpha_annual * 100,
+                beta,
+                correlation
             ],
             benchmark_name: [
-                f"{benchmark_total_return*100:.2f}%",
-                f"{benchmark_cagr*100:.2f}%",
-                f"{benchmark_vol*100:.2f}%",
-                f"{benchmark_sharpe:.2f}",
-                f"{benchmark_sortino:.2f}",
-                f"{benchmark_max_dd*100:.2f}%",
-                f"{benchmark_calmar:.2f}",
-                "0.00%",
-                "1.00",
-                "1.00"
+                benchmark_total_return * 100,
+                benchmark_cagr * 100,
+                benchmark_vol * 100,
+                benchmark_sharpe,
+                benchmark_sortino,
+                benchmark_max_dd * 100,
+                benchmark_calmar,
+                0.0,
+                1.0,
+                1.0
             ],
             'Difference': [
-                f"{(portfolio_total_return - benchmark_total_return)*100:+.2f}%",
-                f"{(portfolio_cagr - benchmark_cagr)*100:+.2f}%",
-                f"{(portfolio_vol - benchmark_vol)*100:+.2f}%",
-                f"{(portfolio_sharpe - benchmark_sharpe):+.2f}",
-                f"{(portfolio_sortino - benchmark_sortino):+.2f}",
-                f"{(portfolio_max_dd - benchmark_max_dd)*100:+.2f}%",
-                f"{(portfolio_calmar - benchmark_calmar):+.2f}",
-                f"{alpha_annual*100:.2f}%",
-                f"{(beta - 1.0):+.2f}",
-                f"{(correlation - 1.0):+.2f}"
+                (portfolio_total_return - benchmark_total_return) * 100,
+                (portfolio_cagr - benchmark_cagr) * 100,
+                (portfolio_vol - benchmark_vol) * 100,
+                portfolio_sharpe - benchmark_sharpe,
+                portfolio_sortino - benchmark_sortino,
+                (portfolio_max_dd - benchmark_max_dd) * 100,
+                portfolio_calmar - benchmark_calmar,
+                alpha_annual * 100,
+                beta - 1.0,
+                correlation - 1.0
             ]
         })
         
-        # Style the dataframe
-        def highlight_better(row):
-            if row.name == 0 or row.name == 1 or row.name == 3 or row.name == 4 or row.name == 6 or row.name == 7:
-                # Higher is better
-                diff_val = float(row['Difference'].rstrip('%').replace('+', ''))
-                if diff_val > 0:
-                    return ['', 'background-color: #d4edda', '', 'background-color: #c3e6cb; font-weight: bold']
-                elif diff_val < 0:
-                    return ['', 'background-color: #f8d7da', '', 'background-color: #f5c6cb; font-weight: bold']
-            elif row.name == 2 or row.name == 5:
-                # Lower is better
-                diff_val = float(row['Difference'].rstrip('%').replace('+', ''))
-                if diff_val < 0:
-                    return ['', 'background-color: #d4edda', '', 'background-color: #c3e6cb; font-weight: bold']
-                elif diff_val > 0:
-                    return ['', 'background-color: #f8d7da', '', 'background-color: #f5c6cb; font-weight: bold']
-            return ['', '', '', '']
-        
-        styled_df = comparison_df.style.apply(highlight_better, axis=1)
+        # Rows shown as percentages vs plain ratios
+        percent_rows = [0, 1, 2, 5, 7]
+        ratio_rows = [3, 4, 6, 8, 9]
+        value_cols = ['Your Portfolio', benchmark_name]
+        
+        # Style the dataframe: +1 = higher is better, -1 = lower is better, 0 = neutral
+        directions = np.array([1, 1, -1, 1, 1, -1, 1, 1, 0, 0])
+        signed_diff = np.sign(comparison_df['Difference'].to_numpy()) * directions
+        
+        def highlight_better(df):
+            styles = np.full(df.shape, '', dtype=object)
+            better = signed_diff > 0
+            worse = signed_diff < 0
+            styles[better, 1] = 'background-color: #d4edda'
+            styles[better, 3] = 'background-color: #c3e6cb; font-weight: bold'
+            styles[worse, 1] = 'background-color: #f8d7da'
+            styles[worse, 3] = 'background-color: #f5c6cb; font-weight: bold'
+            return pd.DataFrame(styles, index=df.index, columns=df.columns)
+        
+        styled_df = (
+            comparison_df.style
+            .apply(highlight_better, axis=None)
+            .format('{:.2f}%', subset=pd.IndexSlice[percent_rows, value_cols])
+            .format('{:+.2f}%', subset=pd.IndexSlice[percent_rows, ['Difference']])
+            .format('{:.2f}', subset=pd.IndexSlice[ratio_rows, value_cols])
+            .format('{:+.2f}', subset=pd.IndexSlice[ratio_rows, ['Difference']])
+        )
         st.dataframe(styled_df, use_container_width=True, hide_index=True)
         
         # Interpretation
@@ -268,48 +492,35 @@ def render(tab5, portfolio_returns, prices, weights, tickers, metrics, current):
         
         st.markdown("### 📈 Cumulative Returns: Portfolio vs Benchmark")
         
-        portfolio_cumulative = (1 + portfolio_returns_aligned).cumprod()
-        benchmark_cumulative = (1 + benchmark_returns_aligned).cumprod()
-        
-        fig = go.Figure()
-        
-        fig.add_trace(go.Scatter(
-            x=portfolio_cumulative.index,
-            y=(portfolio_cumulative - 1) * 100,
-            name='Your Portfolio',
-            line=dict(color='#667eea', width=3),
-            hovertemplate='%{y:.2f}%<extra></extra>'
-        ))
-        
-        fig.add_trace(go.Scatter(
-            x=benchmark_cumulative.index,
-            y=(benchmark_cumulative - 1) * 100,
-            name=benchmark_name,
-            line=dict(color='#f5576c', width=3, dash='dash'),
-            hovertemplate='%{y:.2f}%<extra></extra>'
-        ))
-        
-        fig.update_layout(
-            title=f"Cumulative Returns Comparison",
-            xaxis_title="Date",
-            yaxis_title="Cumulative Return (%)",
-            hovermode='x unified',
-            height=500,
-            template='plotly_white',
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1
-            )
+        # Chart traces are sent to the browser as float32 (plenty for display);
+        # the statistics above stay in float64
+        
+        # One sweep per series gives the growth curve and its drawdown
+        dates = portfolio_returns_aligned.index
+        dates_ms = _to_epoch_ms(dates)
+        
+        # Log returns are shared by the cumulative, drawdown and annual calculations
+        portfolio_log_returns = np.log1p(portfolio_returns_aligned.to_numpy(dtype=np.float64))
+        benchmark_log_returns = np.log1p(benchmark_returns_aligned.to_numpy(dtype=np.float64))
+        portfolio_cumulative, portfolio_dd, _ = calculate_cumulative_drawdown(
+            portfolio_returns_aligned, log_returns=portfolio_log_returns
+        )
+        benchmark_cumulative, benchmark_dd, _ = calculate_cumulative_drawdown(
+            benchmark_returns_aligned, log_returns=benchmark_log_returns
+        )
+        
+        fig = _build_cumulative_figure(
+            dates_ms.tobytes(),
+            ((portfolio_cumulative - 1) * 100).astype(np.float32).tobytes(),
+            ((benchmark_cumulative - 1) * 100).astype(np.float32).tobytes(),
+            benchmark_name
         )
         
         st.plotly_chart(fig, use_container_width=True)
         
         # Interpretation
-        final_portfolio = (portfolio_cumulative.iloc[-1] - 1) * 100
-        final_benchmark = (benchmark_cumulative.iloc[-1] - 1) * 100
+        final_portfolio = (portfolio_cumulative[-1] - 1) * 100
+        final_benchmark = (benchmark_cumulative[-1] - 1) * 100
         outperformance = final_portfolio - final_benchmark
         
         st.markdown("""
@@ -344,44 +555,15 @@ def render(tab5, portfolio_returns, prices, weights, tickers, metrics, current):
         
         st.markdown("### 📉 Drawdown Comparison: Risk Analysis")
         
-        # Calculate drawdowns
-        portfolio_dd = (portfolio_cumulative / portfolio_cumulative.cummax() - 1) * 100
-        benchmark_dd = (benchmark_cumulative / benchmark_cumulative.cummax() - 1) * 100
-        
-        fig = go.Figure()
-        
-        fig.add_trace(go.Scatter(
-            x=portfolio_dd.index,
-            y=portfolio_dd,
-            name='Your Portfolio',
-            fill='tozeroy',
-            line=dict(color='#667eea', width=2),
-            fillcolor='rgba(102, 126, 234, 0.3)',
-            hovertemplate='%{y:.2f}%<extra></extra>'
-        ))
-        
-        fig.add_trace(go.Scatter(
-            x=benchmark_dd.index,
-            y=benchmark_dd,
-            name=benchmark_name,
-            line=dict(color='#f5576c', width=2, dash='dash'),
-            hovertemplate='%{y:.2f}%<extra></extra>'
-        ))
-        
-        fig.update_layout(
-            title="Drawdown Comparison (Lower is Better Risk Management)",
-            xaxis_title="Date",
-            yaxis_title="Drawdown (%)",
-            hovermode='x unified',
-            height=500,
-            template='plotly_white',
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1
-            )
+        # Drawdowns (computed alongside the cumulative curves) in percent
+        portfolio_dd = portfolio_dd * 100
+        benchmark_dd = benchmark_dd * 100
+        
+        fig = _build_drawdown_figure(
+            dates_ms.tobytes(),
+            portfolio_dd.astype(np.float32).tobytes(),
+            benchmark_dd.astype(np.float32).tobytes(),
+            benchmark_name
         )
         
         st.plotly_chart(fig, use_container_width=True)
@@ -406,8 +588,8 @@ def render(tab5, portfolio_returns, prices, weights, tickers, metrics, current):
             )
         
         with col3:
-            avg_portfolio_dd = portfolio_dd[portfolio_dd < 0].mean()
-            avg_benchmark_dd = benchmark_dd[benchmark_dd < 0].mean()
+            avg_portfolio_dd = calculate_mean_negative(portfolio_dd)
+            avg_benchmark_dd = calculate_mean_negative(benchmark_dd)
             st.metric(
                 "Your Avg Drawdown",
                 f"{avg_portfolio_dd:.2f}%",
@@ -448,73 +630,7 @@ def render(tab5, portfolio_returns, prices, weights, tickers, metrics, current):
         
         st.markdown("### 🎢 Rolling Performance Metrics")
         
-        window = st.slider("Select Rolling Window (days)", 30, 365, 90, key="rolling_window_backtest")
-        
-        # Calculate rolling metrics
-        portfolio_rolling_return = portfolio_returns_aligned.rolling(window).mean() * 252 * 100
-        benchmark_rolling_return = benchmark_returns_aligned.rolling(window).mean() * 252 * 100
-        
-        portfolio_rolling_vol = portfolio_returns_aligned.rolling(window).std() * np.sqrt(252) * 100
-        benchmark_rolling_vol = benchmark_returns_aligned.rolling(window).std() * np.sqrt(252) * 100
-        
-        portfolio_rolling_sharpe = (portfolio_rolling_return - 2) / portfolio_rolling_vol
-        benchmark_rolling_sharpe = (benchmark_rolling_return - 2) / benchmark_rolling_vol
-        
-        # Plot rolling returns
-        fig = go.Figure()
-        
-        fig.add_trace(go.Scatter(
-            x=portfolio_rolling_return.index,
-            y=portfolio_rolling_return,
-            name='Your Portfolio',
-            line=dict(color='#667eea', width=2),
-        ))
-        
-        fig.add_trace(go.Scatter(
-            x=benchmark_rolling_return.index,
-            y=benchmark_rolling_return,
-            name=benchmark_name,
-            line=dict(color='#f5576c', width=2, dash='dash'),
-        ))
-        
-        fig.update_layout(
-            title=f"{window}-Day Rolling Annualized Return",
-            xaxis_title="Date",
-            yaxis_title="Annualized Return (%)",
-            hovermode='x unified',
-            height=400,
-            template='plotly_white'
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
-        
-        # Plot rolling Sharpe
-        fig = go.Figure()
-        
-        fig.add_trace(go.Scatter(
-            x=portfolio_rolling_sharpe.index,
-            y=portfolio_rolling_sharpe,
-            name='Your Portfolio',
-            line=dict(color='#667eea', width=2),
-        ))
-        
-        fig.add_trace(go.Scatter(
-            x=benchmark_rolling_sharpe.index,
-            y=benchmark_rolling_sharpe,
-            name=benchmark_name,
-            line=dict(color='#f5576c', width=2, dash='dash'),
-        ))
-        
-        fig.update_layout(
-            title=f"{window}-Day Rolling Sharpe Ratio",
-            xaxis_title="Date",
-            yaxis_title="Sharpe Ratio",
-            hovermode='x unified',
-            height=400,
-            template='plotly_white'
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        _render_rolling_metrics(portfolio_returns_aligned, benchmark_returns_aligned, benchmark_name)
         
         st.markdown("---")
         
@@ -524,24 +640,28 @@ def render(tab5, portfolio_returns, prices, weights, tickers, metrics, current):
         
         st.markdown("### 📅 Year-by-Year Performance")
         
-        # Calculate annual returns
-        portfolio_annual = portfolio_returns_aligned.resample('Y').apply(lambda x: (1 + x).prod() - 1) * 100
-        benchmark_annual = benchmark_returns_aligned.resample('Y').apply(lambda x: (1 + x).prod() - 1) * 100
+        # Calculate annual returns: sum of log returns per calendar year, back to simple returns
+        # (grouping on the year directly leaves the years as the index)
+        years = dates.year
+        portfolio_annual = np.expm1(pd.Series(portfolio_log_returns).groupby(years).sum()) * 100
+        benchmark_annual = np.expm1(pd.Series(benchmark_log_returns).groupby(years).sum()) * 100
         
         if len(portfolio_annual) > 0:
             annual_df = pd.DataFrame({
-                'Year': portfolio_annual.index.year,
+                'Year': portfolio_annual.index,
                 'Your Portfolio': portfolio_annual.values,
                 benchmark_name: benchmark_annual.values,
                 'Difference': (portfolio_annual - benchmark_annual).values
             })
             
-            # Format the dataframe
-            annual_df['Your Portfolio'] = annual_df['Your Portfolio'].apply(lambda x: f"{x:.2f}%")
-            annual_df[benchmark_name] = annual_df[benchmark_name].apply(lambda x: f"{x:.2f}%")
-            annual_df['Difference'] = annual_df['Difference'].apply(lambda x: f"{x:+.2f}%")
+            # Values stay numeric; the Styler formats them for display
+            styled_annual = annual_df.style.format({
+                'Your Portfolio': '{:.2f}%',
+                benchmark_name: '{:.2f}%',
+                'Difference': '{:+.2f}%'
+            })
             
-            st.dataframe(annual_df, use_container_width=True, hide_index=True)
+            st.dataframe(styled_annual, use_container_width=True, hide_index=True)
             
             # Calculate win rate
             wins = (portfolio_annual > benchmark_annual).sum()
@@ -563,35 +683,19 @@ def render(tab5, portfolio_returns, prices, weights, tickers, metrics, current):
         
         st.markdown("### 🎯 Final Verdict")
         
-        # Score the portfolio
-        score = 0
-        max_score = 7
-        
-        # Alpha
-        if alpha_annual > 0.02:
-            score += 2
-        elif alpha_annual > 0:
-            score += 1
-        
-        # Sharpe Ratio
-        if portfolio_sharpe > benchmark_sharpe:
-            score += 1
-        
-        # Max Drawdown
-        if portfolio_max_dd < benchmark_max_dd:
-            score += 1
-        
-        # Total Return
-        if portfolio_total_return > benchmark_total_return:
-            score += 1
-        
-        # Volatility
-        if portfolio_vol < benchmark_vol:
-            score += 1
-        
-        # Sortino Ratio
-        if portfolio_sortino > benchmark_sortino:
-            score += 1
+        # Score the portfolio - one point per criterion met
+        # (alpha counts twice: once for > 0 and again for > 2%)
+        score_criteria = np.array([
+            alpha_annual > 0,
+            alpha_annual > 0.02,
+            portfolio_sharpe > benchmark_sharpe,
+            portfolio_max_dd < benchmark_max_dd,
+            portfolio_total_return > benchmark_total_return,
+            portfolio_vol < benchmark_vol,
+            portfolio_sortino > benchmark_sortino
+        ])
+        score = int(score_criteria.sum())
+        max_score = len(score_criteria)
         
         score_pct = score / max_score * 100
         
@@ -2,14 +2,139 @@
 Tab: Compare Benchmarks
 """
 
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-import matplotlib.pyplot as plt
 from helper_functions import *
 
 
+# Metrics shown in the comparison table (Sharpe also drives the ranking)
+_BENCHMARK_METRIC_FIELDS = (
+    'Annual Return', 'Sharpe Ratio', 'Sortino Ratio', 'Max Drawdown',
+    'Annual Volatility', 'Calmar Ratio', 'Total Return'
+)
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _fetch_bench_returns(symbol, start_date, end_date):
+    """Daily returns and metrics for one benchmark, cached per symbol and date range"""
+    bench_data = get_benchmark_data_openbb(symbol, start_date, end_date)
+    if bench_data is None:
+        return None, None
+    
+    bench_returns = bench_data.pct_change().dropna()
+    bench_returns_series = bench_returns.iloc[:, 0] if isinstance(bench_returns, pd.DataFrame) else bench_returns
+    return bench_returns_series, calculate_portfolio_metrics(bench_returns_series, fields=_BENCHMARK_METRIC_FIELDS)
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _fetch_6040_returns(start_date, end_date):
+    """Daily returns and metrics for a synthetic 60/40 SPY/AGG portfolio"""
+    # One multi-ticker request; the result already shares a date index
+    combined_data = download_ticker_data(['SPY', 'AGG'], start_date, end_date)
+    
+    if combined_data is None or not {'SPY', 'AGG'}.issubset(combined_data.columns):
+        return None, None
+    
+    combined_data = combined_data[['SPY', 'AGG']].dropna()
+    portfolio_6040 = calculate_portfolio_returns(combined_data, np.array([0.6, 0.4]))
+    return portfolio_6040, calculate_portfolio_metrics(portfolio_6040, fields=_BENCHMARK_METRIC_FIELDS)
+
+
+# Chart curves are display-only, so the returns feeding them and the cached curves are
+# float32; the rolling kernel still accumulates its running sums in float64.
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _cached_rolling_sharpe(returns_bytes, window):
+    """Rolling annualized Sharpe (no risk-free rate) keyed on the raw float32 bytes of a returns series"""
+    # Single running-sum sweep (numba kernel when available) instead of two pandas rolling passes
+    returns = np.frombuffer(returns_bytes, dtype=np.float32)
+    return calculate_rolling_ann_stats(returns, window, risk_free_rate=0.0)[:, 2].astype(np.float32)
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _cached_cum_returns(returns_bytes):
+    """Growth of $1 keyed on the raw float32 bytes of a returns series"""
+    returns = np.frombuffer(returns_bytes, dtype=np.float32)
+    return np.exp(np.cumsum(np.log1p(returns)))
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _cached_benchmark_curves(matrix_bytes, n_series, window):
+    """Cumulative returns and rolling Sharpe for a (T, K) float32 benchmark returns matrix, in one batched pass"""
+    returns = np.frombuffer(matrix_bytes, dtype=np.float32).reshape(-1, n_series)
+    cum_returns = np.exp(np.cumsum(np.log1p(returns), axis=0))
+    rolling_sharpe = calculate_rolling_ann_stats(returns, window, risk_free_rate=0.0)[:, :, 2].astype(np.float32)
+    return cum_returns, rolling_sharpe
+
+
+def _benchmark_curves(benchmarks_data, window):
+    """
+    Align all benchmarks on their common dates and compute their chart curves together
+    
+    Returns:
+        (cum_returns, rolling_sharpe) DataFrames with one column per benchmark
+    """
+    bench_df = pd.concat(benchmarks_data, axis=1, join='inner')
+    matrix = np.ascontiguousarray(bench_df.to_numpy(dtype=np.float32))
+    cum_returns, rolling_sharpe = _cached_benchmark_curves(matrix.tobytes(), matrix.shape[1], window)
+    return (pd.DataFrame(cum_returns, index=bench_df.index, columns=bench_df.columns),
+            pd.DataFrame(rolling_sharpe, index=bench_df.index, columns=bench_df.columns))
+
+
+def _downsampled(series, n_out=2000):
+    """Plotted copy of a daily series: non-finite points dropped, then LTTB-reduced to at most n_out points"""
+    series = series[np.isfinite(series.to_numpy(dtype=np.float64))]
+    keep = lttb_downsample(np.arange(len(series)), series.to_numpy(dtype=np.float64), n_out)
+    return series.iloc[keep]
+
+
+def _fetch_all_benchmarks(symbols, start_date, end_date):
+    """
+    Fetch every benchmark concurrently; results come back in the order of symbols
+    
+    Worker threads get the script run context attached so the cached fetchers and
+    any download warnings behave as they do on the main thread.
+    """
+    ctx = get_script_run_ctx()
+    
+    def fetch(symbol):
+        add_script_run_ctx(threading.current_thread(), ctx)
+        if symbol == '60/40':
+            return _fetch_6040_returns(start_date, end_date)
+        return _fetch_bench_returns(symbol, start_date, end_date)
+    
+    if not symbols:
+        return []
+    with ThreadPoolExecutor(max_workers=min(8, len(symbols))) as executor:
+        return list(executor.map(fetch, symbols))
+
+
+def _session_benchmarks(symbols, start_date, end_date):
+    """
+    Benchmark (returns, metrics) pairs held in session_state, fetching only the missing ones
+    
+    Entries for any other date range are evicted. Live objects are reused as-is, skipping
+    the unpickling that an st.cache_data hit costs; failed fetches are retried next rerun.
+    """
+    cache = st.session_state.setdefault('_bench_series_cache', {})
+    for key in [key for key in cache if key[1:] != (start_date, end_date)]:
+        del cache[key]
+    
+    missing = list(dict.fromkeys(s for s in symbols if (s, start_date, end_date) not in cache))
+    if missing:
+        for symbol, result in zip(missing, _fetch_all_benchmarks(missing, start_date, end_date)):
+            if result[0] is not None:
+                cache[(symbol, start_date, end_date)] = result
+    
+    return [cache.get((s, start_date, end_date), (None, None)) for s in symbols]
+
+
 def render(tab8, portfolio_returns, prices, weights, tickers, metrics, current):
     """Render the Compare Benchmarks tab"""
     
@@ -58,43 +183,39 @@ def render(tab8, portfolio_returns, prices, weights, tickers, metrics, current):
             # Combine smart and additional benchmarks
             all_benchmarks = smart_benchmarks + additional_benchmarks
             
+            # Streamlit runs every tab body on each rerun, so the downloads and charts below
+            # stay deferred until the comparison is requested once in this session
+            if not st.session_state.get('_bench_loaded', False):
+                if not st.button("📥 Load Benchmark Comparison", key="load_benchmarks", type="primary"):
+                    st.caption("Benchmark data is downloaded when you load the comparison.")
+                    return
+                st.session_state['_bench_loaded'] = True
+            
             # Download benchmark data
             benchmarks_data = {}
             benchmarks_metrics = {}
             
-            for benchmark_symbol, reason in all_benchmarks:
-                if benchmark_symbol == '60/40':
-                    # Create synthetic 60/40 portfolio
-                    spy_data = download_ticker_data(['SPY'], current['start_date'], current['end_date'])
-                    agg_data = download_ticker_data(['AGG'], current['start_date'], current['end_date'])
-                    
-                    if spy_data is not None and agg_data is not None:
-                        combined_data = pd.DataFrame({
-                            'SPY': spy_data.iloc[:, 0] if isinstance(spy_data, pd.DataFrame) else spy_data,
-                            'AGG': agg_data.iloc[:, 0] if isinstance(agg_data, pd.DataFrame) else agg_data
-                        }).dropna()
-                        
-                        portfolio_6040 = calculate_portfolio_returns(combined_data, np.array([0.6, 0.4]))
-                        benchmarks_data['60/40'] = portfolio_6040
-                        benchmarks_metrics['60/40'] = calculate_portfolio_metrics(portfolio_6040)
-                else:
-                    # Download single benchmark
-                    bench_data = get_benchmark_data_openbb(benchmark_symbol, current['start_date'], current['end_date'])
-                    if bench_data is not None:
-                        bench_returns = bench_data.pct_change().dropna()
-                        bench_returns_series = bench_returns.iloc[:, 0] if isinstance(bench_returns, pd.DataFrame) else bench_returns
-                        benchmarks_data[benchmark_symbol] = bench_returns_series
-                        benchmarks_metrics[benchmark_symbol] = calculate_portfolio_metrics(bench_returns_series)
+            # Returns and metrics are kept per symbol and date range in the session, so toggling
+            # a benchmark checkbox only fetches the newly added symbol; misses download in parallel
+            benchmark_symbols = [benchmark_symbol for benchmark_symbol, _ in all_benchmarks]
+            fetched = _session_benchmarks(benchmark_symbols, current['start_date'], current['end_date'])
+            
+            for benchmark_symbol, (bench_returns, bench_metrics) in zip(benchmark_symbols, fetched):
+                if bench_returns is not None:
+                    benchmarks_data[benchmark_symbol] = bench_returns
+                    benchmarks_metrics[benchmark_symbol] = bench_metrics
             
             if not benchmarks_data:
                 st.warning("⚠️ Could not load benchmark data. Please check your internet connection.")
             else:
+                # Portfolio returns unwrapped once; both chart paths below reuse these
+                port_idx = portfolio_returns.index
+                port_bytes = portfolio_returns.to_numpy(dtype=np.float32).tobytes()
+                
                 # Enhanced Metrics Comparison Table
                 st.markdown("---")
                 st.markdown("### 📊 Comprehensive Metrics Comparison")
                 
-                comparison_rows = []
-                
                 # Key metrics to compare
                 metric_configs = [
                     ('Annual Return', 'Annual Return', 'higher_better', '%'),
@@ -105,37 +226,36 @@ def render(tab8, portfolio_returns, prices, weights, tickers, metrics, current):
                     ('Calmar Ratio', 'Calmar Ratio', 'higher_better', 'ratio'),
                     ('Total Return', 'Total Return', 'higher_better', '%')
                 ]
+                metric_names, metric_keys, comparison_types, format_types = zip(*metric_configs)
                 
-                for metric_display, metric_key, comparison_type, format_type in metric_configs:
-                    row = {'Metric': metric_display}
-                    
-                    # Add portfolio value
-                    port_value = metrics[metric_key]
-                    if format_type == '%':
-                        row['Your Portfolio'] = f"{port_value:.2%}"
-                    else:
-                        row['Your Portfolio'] = f"{port_value:.2f}"
-                    
-                    # Add benchmark values with comparison arrows
-                    for bench_name, bench_metrics in benchmarks_metrics.items():
-                        bench_value = bench_metrics[metric_key]
-                        
-                        # Determine if portfolio is better
-                        if comparison_type == 'higher_better':
-                            is_better = port_value > bench_value
-                            arrow = " 🟢↑" if is_better else " 🔴↓"
-                        else:  # lower_better
-                            is_better = port_value < bench_value
-                            arrow = " 🟢↑" if is_better else " 🔴↓"
-                        
-                        if format_type == '%':
-                            row[bench_name] = f"{bench_value:.2%}{arrow}"
-                        else:
-                            row[bench_name] = f"{bench_value:.2f}{arrow}"
-                    
-                    comparison_rows.append(row)
+                # (n_metrics,) portfolio values and (n_metrics, n_benchmarks) benchmark values
+                port_vals = np.array([metrics[k] for k in metric_keys], dtype=np.float64)
+                bench_mat = np.array(
+                    [[bench_metrics[k] for bench_metrics in benchmarks_metrics.values()] for k in metric_keys],
+                    dtype=np.float64
+                ).reshape(len(metric_keys), len(benchmarks_metrics))
                 
-                comparison_df = pd.DataFrame(comparison_rows)
+                # Portfolio better than each benchmark, per metric
+                higher_better = np.array(comparison_types) == 'higher_better'
+                is_better = np.where(
+                    higher_better[:, None],
+                    port_vals[:, None] > bench_mat,
+                    port_vals[:, None] < bench_mat
+                )
+                arrows = np.where(is_better, " 🟢↑", " 🔴↓")
+                
+                # Percent rows and ratio rows are formatted as whole blocks
+                is_pct = (np.array(format_types) == '%')[:, None]
+                values = np.column_stack([port_vals, bench_mat])
+                cells = np.where(
+                    is_pct,
+                    np.char.mod('%.2f%%', values * 100),
+                    np.char.mod('%.2f', values)
+                ).astype(object)
+                cells[:, 1:] = cells[:, 1:] + arrows
+                
+                comparison_df = pd.DataFrame(cells, columns=['Your Portfolio', *benchmarks_metrics.keys()])
+                comparison_df.insert(0, 'Metric', metric_names)
                 st.dataframe(comparison_df, use_container_width=True, hide_index=True)
                 
                 st.markdown("""
@@ -148,15 +268,13 @@ def render(tab8, portfolio_returns, prices, weights, tickers, metrics, current):
                 st.markdown("---")
                 st.markdown("### 🏆 Percentile Ranking")
                 
-                # Collect all Sharpe ratios for ranking
-                all_sharpes = [metrics['Sharpe Ratio']]
-                for bench_metrics in benchmarks_metrics.values():
-                    all_sharpes.append(bench_metrics['Sharpe Ratio'])
-                
-                # Calculate percentile
+                # Benchmark Sharpe ratios are already a row of the comparison matrix
+                bench_sharpes = bench_mat[metric_keys.index('Sharpe Ratio')]
                 portfolio_sharpe = metrics['Sharpe Ratio']
-                better_than_count = sum(1 for s in all_sharpes if portfolio_sharpe > s)
-                percentile = (better_than_count / len(all_sharpes)) * 100
+                better_count = int(np.count_nonzero(portfolio_sharpe > bench_sharpes))
+                
+                # Percentile among the portfolio plus all benchmarks
+                percentile = better_count / (len(bench_sharpes) + 1) * 100
                 
                 col1, col2, col3 = st.columns(3)
                 
@@ -168,8 +286,6 @@ def render(tab8, portfolio_returns, prices, weights, tickers, metrics, current):
                     )
                 
                 with col2:
-                    better_count = sum(1 for _, bench_metrics in benchmarks_metrics.items() 
-                                    if metrics['Sharpe Ratio'] > bench_metrics['Sharpe Ratio'])
                     st.metric(
                         "Benchmarks Beaten",
                         f"{better_count} of {len(benchmarks_metrics)}",
@@ -214,29 +330,57 @@ def render(tab8, portfolio_returns, prices, weights, tickers, metrics, current):
                 st.markdown("---")
                 st.markdown("### 📈 Cumulative Performance Over Time")
                 
-                fig, ax = plt.subplots(figsize=(14, 8))
+                # Benchmark curves for both charts come from one pass over the aligned (T, K) matrix
+                window = 60
+                bench_cum_returns, bench_rolling_sharpes = _benchmark_curves(benchmarks_data, window)
+                
+                fig = go.Figure()
                 
                 # Plot portfolio
-                cum_returns_portfolio = (1 + portfolio_returns).cumprod()
-                cum_returns_portfolio.plot(ax=ax, linewidth=3, label='Your Portfolio', color='#667eea')
+                cum_returns_portfolio = _downsampled(pd.Series(_cached_cum_returns(port_bytes), index=port_idx))
+                fig.add_trace(go.Scattergl(
+                    x=cum_returns_portfolio.index,
+                    y=cum_returns_portfolio.values,
+                    name='Your Portfolio',
+                    line=dict(color='#667eea', width=3),
+                    hovertemplate='%{y:.2f}<extra></extra>'
+                ))
                 
                 # Plot benchmarks
+                # Colours follow each symbol's slot in the requested benchmark list, so a benchmark
+                # that fails to load doesn't shift the colours (and traces) of the others
                 colors = ['#28a745', '#dc3545', '#ffc107', '#17a2b8', '#6f42c1', '#fd7e14']
-                for i, (name, returns) in enumerate(benchmarks_data.items()):
-                    cum_returns_bench = (1 + returns).cumprod()
-                    cum_returns_bench.plot(ax=ax, linewidth=2, label=name, 
-                                        color=colors[i % len(colors)], linestyle='--', alpha=0.8)
+                benchmark_colors = {
+                    name: colors[i % len(colors)] for i, name in enumerate(dict.fromkeys(benchmark_symbols))
+                }
+                for name, cum_returns in bench_cum_returns.items():
+                    cum_returns_bench = _downsampled(cum_returns)
+                    fig.add_trace(go.Scattergl(
+                        x=cum_returns_bench.index,
+                        y=cum_returns_bench.values,
+                        name=name,
+                        line=dict(color=benchmark_colors[name], width=2, dash='dash'),
+                        opacity=0.8,
+                        hovertemplate='%{y:.2f}<extra></extra>'
+                    ))
                 
-                ax.set_title('Performance Comparison vs Smart Benchmarks', fontsize=16, fontweight='bold', pad=20)
-                ax.set_xlabel('Date', fontsize=12, fontweight='bold')
-                ax.set_ylabel('Cumulative Return', fontsize=12, fontweight='bold')
-                ax.legend(loc='best', frameon=True, shadow=True, fontsize=10)
-                ax.grid(True, alpha=0.3, linestyle='--')
-                ax.set_facecolor('#f8f9fa')
-                fig.patch.set_facecolor('white')
+                fig.update_layout(
+                    title='Performance Comparison vs Smart Benchmarks',
+                    xaxis_title='Date',
+                    yaxis_title='Cumulative Return',
+                    hovermode='x unified',
+                    height=550,
+                    template='plotly_white',
+                    legend=dict(
+                        orientation="h",
+                        yanchor="bottom",
+                        y=1.02,
+                        xanchor="right",
+                        x=1
+                    )
+                )
                 
-                plt.tight_layout()
-                st.pyplot(fig)
+                st.plotly_chart(fig, use_container_width=True)
                 
                 # Smart interpretation
                 st.markdown("""
@@ -273,30 +417,50 @@ def render(tab8, portfolio_returns, prices, weights, tickers, metrics, current):
                 st.markdown("---")
                 st.markdown("### 📈 Rolling Sharpe Ratio (Risk-Adjusted Performance Over Time)")
                 
-                window = 60
-                portfolio_rolling_sharpe = (portfolio_returns.rolling(window).mean() * 252) / (portfolio_returns.rolling(window).std() * np.sqrt(252))
+                portfolio_rolling_sharpe = pd.Series(_cached_rolling_sharpe(port_bytes, window), index=port_idx)
                 
-                fig, ax = plt.subplots(figsize=(14, 8))
-                portfolio_rolling_sharpe.plot(ax=ax, linewidth=3, label='Your Portfolio', color='#667eea')
+                fig = go.Figure()
+                portfolio_sharpe_plot = _downsampled(portfolio_rolling_sharpe)
+                fig.add_trace(go.Scattergl(
+                    x=portfolio_sharpe_plot.index,
+                    y=portfolio_sharpe_plot.values,
+                    name='Your Portfolio',
+                    line=dict(color='#667eea', width=3),
+                    hovertemplate='%{y:.2f}<extra></extra>'
+                ))
                 
-                for i, (name, returns) in enumerate(benchmarks_data.items()):
-                    bench_rolling_sharpe = (returns.rolling(window).mean() * 252) / (returns.rolling(window).std() * np.sqrt(252))
-                    bench_rolling_sharpe.plot(ax=ax, linewidth=2, label=name,
-                                            color=colors[i % len(colors)], linestyle='--', alpha=0.8)
+                for name, rolling_sharpe in bench_rolling_sharpes.items():
+                    bench_rolling_sharpe = _downsampled(rolling_sharpe)
+                    fig.add_trace(go.Scattergl(
+                        x=bench_rolling_sharpe.index,
+                        y=bench_rolling_sharpe.values,
+                        name=name,
+                        line=dict(color=benchmark_colors[name], width=2, dash='dash'),
+                        opacity=0.8,
+                        hovertemplate='%{y:.2f}<extra></extra>'
+                    ))
                 
-                ax.axhline(y=1, color='#28a745', linestyle=':', linewidth=1.5, alpha=0.7, label='Good (1.0)')
-                ax.axhline(y=0, color='#dc3545', linestyle=':', linewidth=1.5, alpha=0.7)
+                fig.add_hline(y=1, line=dict(color='#28a745', dash='dot', width=1.5), opacity=0.7,
+                              annotation_text='Good (1.0)', annotation_position='top left')
+                fig.add_hline(y=0, line=dict(color='#dc3545', dash='dot', width=1.5), opacity=0.7)
                 
-                ax.set_title(f'Rolling {window}-Day Sharpe Ratio Comparison', fontsize=16, fontweight='bold', pad=20)
-                ax.set_xlabel('Date', fontsize=12, fontweight='bold')
-                ax.set_ylabel('Sharpe Ratio', fontsize=12, fontweight='bold')
-                ax.legend(loc='best', frameon=True, shadow=True, fontsize=10)
-                ax.grid(True, alpha=0.3, linestyle='--')
-                ax.set_facecolor('#f8f9fa')
-                fig.patch.set_facecolor('white')
+                fig.update_layout(
+                    title=f'Rolling {window}-Day Sharpe Ratio Comparison',
+                    xaxis_title='Date',
+                    yaxis_title='Sharpe Ratio',
+                    hovermode='x unified',
+                    height=550,
+                    template='plotly_white',
+                    legend=dict(
+                        orientation="h",
+                        yanchor="bottom",
+                        y=1.02,
+                        xanchor="right",
+                        x=1
+                    )
+                )
                 
-                plt.tight_layout()
-                st.pyplot(fig)
+                st.plotly_chart(fig, use_container_width=True)
                 
                 st.markdown("""
                     <div class="interpretation-box">
@@ -6,10 +6,129 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-import matplotlib.pyplot as plt
+from plotly.colors import qualitative
 from helper_functions import *
 
 
+@st.cache_data(ttl=86400, show_spinner=False)
+def _get_etf_info(symbol):
+    """yfinance info dict for one ETF, cached per symbol so reruns skip the scrape"""
+    return get_etf_info_yf(symbol)
+
+
+@st.cache_data(show_spinner=False)
+def _cached_optimize(prices, method='max_sharpe'):
+    """Optimal weights, recomputed only when the price history changes"""
+    return optimize_portfolio(prices, method=method)
+
+
+@st.cache_data(show_spinner=False)
+def _cached_frontier(prices, num_portfolios):
+    """Random-portfolio frontier cloud, cached so reruns reuse the same sample"""
+    return calculate_efficient_frontier(prices, num_portfolios=num_portfolios)
+
+
+@st.cache_data(show_spinner=False)
+def _weights_to_csv(weight_items):
+    """CSV export of (ticker, weight) pairs, serialized once per set of weights"""
+    return pd.DataFrame(weight_items, columns=['Ticker', 'Weight']).to_csv(index=False).encode()
+
+
+def _optimal_portfolio(prices):
+    """Optimal weights, returns and metrics, computed once per price history per session"""
+    key = (tuple(prices.columns), hash(pd.util.hash_pandas_object(prices).values.tobytes()))
+    state = st.session_state.get('_opt_state')
+    if state is None or state['key'] != key:
+        optimal_weights = _cached_optimize(prices, method='max_sharpe')
+        optimal_returns = calculate_portfolio_returns(prices, optimal_weights)
+        state = {
+            'key': key,
+            'weights': optimal_weights,
+            'returns': optimal_returns,
+            'metrics': calculate_portfolio_metrics(optimal_returns)
+        }
+        st.session_state['_opt_state'] = state
+    return state
+
+
+def _etf_history(symbol, prices, start_date, end_date):
+    """
+    Daily returns and metrics for one ETF, held in session_state per (symbol, start, end)
+    
+    Holdings already in the portfolio reuse the loaded price column; only ETFs
+    outside it are downloaded.
+    """
+    cache = st.session_state.setdefault('_etf_history', {})
+    key = (symbol, start_date, end_date)
+    if key not in cache:
+        if symbol in prices.columns:
+            etf_data_prices = prices[[symbol]]
+        else:
+            etf_data_prices = download_ticker_data([symbol], start_date, end_date)
+        if etf_data_prices is None:
+            # Not cached, so a failed download is retried on the next rerun
+            return None, None
+        etf_returns = etf_data_prices.pct_change().dropna()
+        cache[key] = (etf_returns, calculate_portfolio_metrics(etf_returns))
+    return cache[key]
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _build_pie_figure(labels, values, title):
+    """Allocation pie chart, reused across reruns with identical weights"""
+    fig = go.Figure(go.Pie(
+        labels=labels,
+        values=values,
+        sort=False,
+        direction='counterclockwise',
+        rotation=90,
+        textinfo='percent',
+        texttemplate='%{percent:.1%}',
+        marker=dict(colors=qualitative.Set3, line=dict(color='white', width=1))
+    ))
+    
+    fig.update_layout(
+        title=title,
+        height=450,
+        template='plotly_white',
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=-0.15,
+            xanchor="center",
+            x=0.5
+        )
+    )
+    
+    return fig
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _build_performance_figure(dates_ms_bytes, cum_bytes, symbol):
+    """Cumulative performance line for the selected ETF, reused across reruns"""
+    fig = go.Figure()
+    
+    fig.add_trace(go.Scattergl(
+        x=np.frombuffer(dates_ms_bytes, dtype=np.int64),
+        y=np.frombuffer(cum_bytes, dtype=np.float32),
+        name=symbol,
+        line=dict(color='#667eea', width=2),
+        hovertemplate='%{y:.3f}<extra></extra>'
+    ))
+    
+    fig.update_layout(
+        title=f"{symbol} - Cumulative Performance",
+        xaxis_title="Date",
+        xaxis_type='date',
+        yaxis_title="Cumulative Return",
+        hovermode='x unified',
+        height=500,
+        template='plotly_white'
+    )
+    
+    return fig
+
+
 def render(tab9, portfolio_returns, prices, weights, tickers, metrics, current):
     """Render the Optimization tab"""
     
@@ -43,12 +162,22 @@ def render(tab9, portfolio_returns, prices, weights, tickers, metrics, current):
             if selected_etf:
                 # Get expense ratio from yfinance
                 try:
-                    etf_ticker = yf.Ticker(selected_etf)
-                    etf_info = etf_ticker.info
+                    etf_info = _get_etf_info(selected_etf)
                     
                     # Basic Information Section
                     st.markdown(f"#### 📋 {selected_etf} - Basic Information")
                     
+                    # One position-size input drives the cost caption and every savings figure
+                    user_portfolio_value = st.number_input(
+                        f"Your {selected_etf} position value ($)",
+                        min_value=1000,
+                        max_value=10000000,
+                        value=100000,
+                        step=10000,
+                        key="etf_position_value",
+                        help="Enter your position size to calculate costs and savings"
+                    )
+                    
                     col1, col2, col3, col4 = st.columns(4)
                     
                     with col1:
@@ -58,9 +187,8 @@ def render(tab9, portfolio_returns, prices, weights, tickers, metrics, current):
                             f"{expense_ratio:.2%}",
                             help="Annual fee as percentage of investment"
                         )
-                        portfolio_value = 100000  # Default
-                        annual_cost = portfolio_value * expense_ratio
-                        st.caption(f"${annual_cost:,.0f}/year on $100k")
+                        annual_cost = user_portfolio_value * expense_ratio
+                        st.caption(f"${annual_cost:,.0f}/year on ${user_portfolio_value:,.0f}")
                     
                     with col2:
                         aum = etf_info.get('totalAssets', 0)
@@ -99,70 +227,56 @@ def render(tab9, portfolio_returns, prices, weights, tickers, metrics, current):
                     
                     alternatives = get_cheaper_etf_alternatives(selected_etf, expense_ratio)
                     
-                    if alternatives and expense_ratio > 0:
+                    if len(alternatives) and expense_ratio > 0:
                         st.success(f"**Found {len(alternatives)} cheaper alternative(s) for {selected_etf}!**")
                         
-                        for alt in alternatives:
-                            col1, col2, col3 = st.columns([2, 1, 2])
-                            
-                            with col1:
-                                st.markdown(f"**{alt['symbol']}** - {alt['name']}")
-                                st.caption(f"Tracking: {alt['tracking']}")
-                            
-                            with col2:
-                                st.metric(
-                                    "Expense Ratio",
-                                    f"{alt['expense_ratio']:.2%}"
-                                )
-                            
-                            with col3:
-                                # Calculate savings
-                                user_portfolio_value = st.number_input(
-                                    f"Your {selected_etf} position value ($)",
-                                    min_value=1000,
-                                    max_value=10000000,
-                                    value=100000,
-                                    step=10000,
-                                    key=f"portfolio_value_{alt['symbol']}",
-                                    help="Enter your position size to calculate savings"
-                                )
-                                
-                                savings = calculate_expense_ratio_savings(
-                                    expense_ratio,
-                                    alt['expense_ratio'],
-                                    user_portfolio_value
-                                )
-                                
-                                st.metric(
-                                    "Annual Savings",
-                                    f"${savings['annual_savings']:,.0f}",
-                                    f"{savings['percent_cheaper']:.0f}% cheaper"
-                                )
-                                st.caption(f"20-year savings: ${savings['savings_20y']:,.0f}")
+                        # One vectorized call for every alternative
+                        savings = calculate_expense_ratio_savings(
+                            expense_ratio,
+                            alternatives['expense_ratio'].to_numpy(),
+                            user_portfolio_value
+                        )
                         
-                        # Summary recommendation
-                        best_alt = alternatives[0] if alternatives else None
-                        if best_alt:
-                            savings = calculate_expense_ratio_savings(
-                                expense_ratio,
-                                best_alt['expense_ratio'],
-                                user_portfolio_value
-                            )
-                            
-                            st.markdown(f"""
-                                <div class="interpretation-box">
-                                    <div class="interpretation-title">💡 Recommendation</div>
-                                    <p><strong>Switch from {selected_etf} to {best_alt['symbol']}</strong></p>
-                                    <ul>
-                                        <li>Save <strong>${savings['annual_savings']:,.0f}/year</strong> on a ${user_portfolio_value:,.0f} position</li>
-                                        <li>That's <strong>{savings['percent_cheaper']:.0f}% cheaper</strong> for the same exposure</li>
-                                        <li>Over 20 years: <strong>${savings['savings_20y']:,.0f}</strong> saved (with compound growth)</li>
-                                        <li>Same index, same holdings, same performance - just lower fees!</li>
-                                    </ul>
-                                    <p><strong>🎯 Action:</strong> If you're in a taxable account, check if switching triggers capital gains tax. 
-                                    In tax-advantaged accounts (401k, IRA), switch immediately - no tax impact!</p>
-                                </div>
-                            """, unsafe_allow_html=True)
+                        alternatives_df = pd.DataFrame({
+                            'Alternative': alternatives['symbol'],
+                            'Name': alternatives['name'],
+                            'Tracking': alternatives['tracking'],
+                            'Expense Ratio': alternatives['expense_ratio'],
+                            'Annual Savings': savings['annual_savings'],
+                            'Cheaper': savings['percent_cheaper'],
+                            '20-Year Savings': savings['savings_20y']
+                        })
+                        st.dataframe(
+                            alternatives_df.style.format({
+                                'Expense Ratio': '{:.2%}',
+                                'Annual Savings': '${:,.0f}',
+                                'Cheaper': '{:.0f}%',
+                                '20-Year Savings': '${:,.0f}'
+                            }),
+                            use_container_width=True,
+                            hide_index=True
+                        )
+                        
+                        # Summary recommendation (first listed alternative)
+                        best_alt = alternatives.iloc[0]
+                        best_annual = savings['annual_savings'][0]
+                        best_percent = savings['percent_cheaper'][0]
+                        best_20y = savings['savings_20y'][0]
+                        
+                        st.markdown(f"""
+                            <div class="interpretation-box">
+                                <div class="interpretation-title">💡 Recommendation</div>
+                                <p><strong>Switch from {selected_etf} to {best_alt['symbol']}</strong></p>
+                                <ul>
+                                    <li>Save <strong>${best_annual:,.0f}/year</strong> on a ${user_portfolio_value:,.0f} position</li>
+                                    <li>That's <strong>{best_percent:.0f}% cheaper</strong> for the same exposure</li>
+                                    <li>Over 20 years: <strong>${best_20y:,.0f}</strong> saved (with compound growth)</li>
+                                    <li>Same index, same holdings, same performance - just lower fees!</li>
+                                </ul>
+                                <p><strong>🎯 Action:</strong> If you're in a taxable account, check if switching triggers capital gains tax. 
+                                In tax-advantaged accounts (401k, IRA), switch immediately - no tax impact!</p>
+                            </div>
+                        """, unsafe_allow_html=True)
                     
                     elif expense_ratio > 0:
                         st.info(f"**{selected_etf}** already has competitive fees. No cheaper alternatives found in our database.")
@@ -195,10 +309,8 @@ def render(tab9, portfolio_returns, prices, weights, tickers, metrics, current):
                     st.markdown("#### 📈 Performance History")
                     
                     # Show simple performance metrics
-                    etf_data_prices = download_ticker_data([selected_etf], current['start_date'], current['end_date'])
-                    if etf_data_prices is not None:
-                        etf_returns = etf_data_prices.pct_change().dropna()
-                        etf_metrics = calculate_portfolio_metrics(etf_returns)
+                    etf_returns, etf_metrics = _etf_history(selected_etf, prices, current['start_date'], current['end_date'])
+                    if etf_returns is not None:
                         
                         col1, col2, col3, col4 = st.columns(4)
                         
@@ -214,19 +326,18 @@ def render(tab9, portfolio_returns, prices, weights, tickers, metrics, current):
                         with col4:
                             st.metric("Max Drawdown", f"{etf_metrics['Max Drawdown']:.2%}")
                         
-                        # Simple performance chart
-                        cum_returns = (1 + etf_returns).cumprod()
-                        
-                        fig, ax = plt.subplots(figsize=(12, 6))
-                        cum_returns.plot(ax=ax, linewidth=2, color='#667eea')
-                        ax.set_title(f'{selected_etf} - Cumulative Performance', fontsize=14, fontweight='bold')
-                        ax.set_xlabel('Date', fontsize=11)
-                        ax.set_ylabel('Cumulative Return', fontsize=11)
-                        ax.grid(True, alpha=0.3)
-                        ax.set_facecolor('#f8f9fa')
-                        fig.patch.set_facecolor('white')
-                        plt.tight_layout()
-                        st.pyplot(fig)
+                        if st.toggle("Show performance chart", key="show_etf_chart"):
+                            # Simple performance chart
+                            # Growth of $1 via log-space cumsum (one ufunc scan instead of a running product)
+                            etf_values = np.nan_to_num(etf_returns.iloc[:, 0].to_numpy(dtype=np.float64))
+                            cum_returns = np.exp(np.cumsum(np.log1p(etf_values)))
+                            
+                            fig = _build_performance_figure(
+                                etf_returns.index.values.astype('datetime64[ms]').astype(np.int64).tobytes(),
+                                cum_returns.astype(np.float32).tobytes(),
+                                selected_etf
+                            )
+                            st.plotly_chart(fig, use_container_width=True)
                     
                 except Exception as e:
                     st.error(f"Could not fetch detailed data for {selected_etf}: {str(e)}")
@@ -238,66 +349,69 @@ def render(tab9, portfolio_returns, prices, weights, tickers, metrics, current):
             
             # Calculate optimal weights
             with st.spinner("Optimizing portfolio..."):
-                optimal_weights = optimize_portfolio(prices, method='max_sharpe')
-                optimal_returns = calculate_portfolio_returns(prices, optimal_weights)
-                optimal_metrics = calculate_portfolio_metrics(optimal_returns)
+                optimal = _optimal_portfolio(prices)
+                optimal_weights = optimal['weights']
+                optimal_returns = optimal['returns']
+                optimal_metrics = optimal['metrics']
+            
+            # Materialize tickers/weights once; the tuples feed the tables, the pies (as cache keys) and the export
+            current_tickers, current_values = tuple(weights), tuple(weights.values())
+            optimal_tickers = tuple(prices.columns)
+            optimal_values = tuple(float(w) for w in optimal_weights)
+            optimal_weights_dict = dict(zip(optimal_tickers, optimal_values))
             
             col1, col2 = st.columns(2)
             
             with col1:
                 st.markdown("#### Current Allocation")
                 current_weights_df = pd.DataFrame({
-                    'Ticker': list(weights.keys()),
-                    'Weight': [f"{w*100:.2f}%" for w in weights.values()]
+                    'Ticker': current_tickers,
+                    'Weight': current_values
                 })
-                st.dataframe(current_weights_df, use_container_width=True, hide_index=True)
+                st.dataframe(
+                    current_weights_df.style.format({'Weight': '{:.2%}'}),
+                    use_container_width=True,
+                    hide_index=True
+                )
                 
-                fig, ax = plt.subplots(figsize=(8, 8))
-                colors = plt.cm.Set3(range(len(weights)))
-                ax.pie(weights.values(), labels=weights.keys(), autopct='%1.1f%%',
-                    colors=colors, startangle=90)
-                ax.set_title('Current Allocation', fontsize=14, fontweight='bold', pad=20)
-                st.pyplot(fig)
+                fig = _build_pie_figure(current_tickers, current_values, 'Current Allocation')
+                st.plotly_chart(fig, use_container_width=True)
             
             with col2:
                 st.markdown("#### Optimal Allocation (Max Sharpe)")
-                optimal_weights_dict = {ticker: w for ticker, w in zip(prices.columns, optimal_weights)}
                 optimal_weights_df = pd.DataFrame({
-                    'Ticker': list(optimal_weights_dict.keys()),
-                    'Weight': [f"{w*100:.2f}%" for w in optimal_weights_dict.values()]
+                    'Ticker': optimal_tickers,
+                    'Weight': optimal_values
                 })
-                st.dataframe(optimal_weights_df, use_container_width=True, hide_index=True)
+                st.dataframe(
+                    optimal_weights_df.style.format({'Weight': '{:.2%}'}),
+                    use_container_width=True,
+                    hide_index=True
+                )
                 
-                fig, ax = plt.subplots(figsize=(8, 8))
-                ax.pie(optimal_weights_dict.values(), labels=optimal_weights_dict.keys(), 
-                    autopct='%1.1f%%', colors=colors, startangle=90)
-                ax.set_title('Optimal Allocation', fontsize=14, fontweight='bold', pad=20)
-                st.pyplot(fig)
+                fig = _build_pie_figure(optimal_tickers, optimal_values, 'Optimal Allocation')
+                st.plotly_chart(fig, use_container_width=True)
             
             # Metrics Comparison
             st.markdown("---")
             st.markdown("### 📈 Performance Comparison")
             
-            comparison_data = {
+            comparison_keys = ['Annual Return', 'Annual Volatility', 'Sharpe Ratio', 'Max Drawdown', 'Sortino Ratio']
+            comparison_df = pd.DataFrame({
                 'Metric': ['Annual Return', 'Volatility', 'Sharpe Ratio', 'Max Drawdown', 'Sortino Ratio'],
-                'Current Portfolio': [
-                    f"{metrics['Annual Return']:.2%}",
-                    f"{metrics['Annual Volatility']:.2%}",
-                    f"{metrics['Sharpe Ratio']:.2f}",
-                    f"{metrics['Max Drawdown']:.2%}",
-                    f"{metrics['Sortino Ratio']:.2f}"
-                ],
-                'Optimal Portfolio': [
-                    f"{optimal_metrics['Annual Return']:.2%}",
-                    f"{optimal_metrics['Annual Volatility']:.2%}",
-                    f"{optimal_metrics['Sharpe Ratio']:.2f}",
-                    f"{optimal_metrics['Max Drawdown']:.2%}",
-                    f"{optimal_metrics['Sortino Ratio']:.2f}"
-                ]
-            }
+                'Current Portfolio': [float(metrics[k]) for k in comparison_keys],
+                'Optimal Portfolio': [float(optimal_metrics[k]) for k in comparison_keys]
+            })
             
-            comparison_df = pd.DataFrame(comparison_data)
-            st.dataframe(comparison_df, use_container_width=True, hide_index=True)
+            # Percent rows and ratio rows share columns, so format by row subset
+            value_cols = ['Current Portfolio', 'Optimal Portfolio']
+            st.dataframe(
+                comparison_df.style
+                    .format('{:.2%}', subset=pd.IndexSlice[[0, 1, 3], value_cols])
+                    .format('{:.2f}', subset=pd.IndexSlice[[2, 4], value_cols]),
+                use_container_width=True,
+                hide_index=True
+            )
             
             # Optimization interpretation
             st.markdown("""
@@ -335,60 +449,65 @@ def render(tab9, portfolio_returns, prices, weights, tickers, metrics, current):
             st.markdown("---")
             st.markdown("### 📊 Efficient Frontier")
             
-            with st.spinner("Calculating efficient frontier..."):
-                results, weights_array = calculate_efficient_frontier(prices, num_portfolios=500)
+            # Streamlit runs every tab body on each rerun, so the 500-portfolio sweep and the
+            # matplotlib render only happen while the section is switched on
+            if not st.toggle("Show efficient frontier", key="show_efficient_frontier"):
+                st.caption("Switch on to sample 500 random portfolios and plot them against your allocation.")
+            else:
+                with st.spinner("Calculating efficient frontier..."):
+                    results, weights_array = _cached_frontier(prices, 500)
+                    
+                    # Current and optimal portfolio metrics
+                    current_annual_return = metrics['Annual Return']
+                    current_annual_vol = metrics['Annual Volatility']
+                    
+                    optimal_annual_return = optimal_metrics['Annual Return']
+                    optimal_annual_vol = optimal_metrics['Annual Volatility']
                 
-                # Current and optimal portfolio metrics
-                current_annual_return = metrics['Annual Return']
-                current_annual_vol = metrics['Annual Volatility']
+                fig = plot_efficient_frontier(results, optimal_weights, optimal_annual_return, optimal_annual_vol)
                 
-                optimal_annual_return = optimal_metrics['Annual Return']
-                optimal_annual_vol = optimal_metrics['Annual Volatility']
-            
-            fig = plot_efficient_frontier(results, optimal_weights, optimal_annual_return, optimal_annual_vol)
-            
-            # Add current portfolio to plot
-            ax = fig.axes[0]
-            ax.scatter(current_annual_vol, current_annual_return, marker='o', color='blue',
-                    s=400, label='Current Portfolio', edgecolors='black', linewidths=2)
-            
-            # Update legend
-            ax.legend(loc='best', frameon=True, shadow=True, fontsize=11)
-            
-            st.pyplot(fig)
-            
-            # Efficient frontier interpretation
-            st.markdown("""
-                <div class="interpretation-box">
-                    <div class="interpretation-title">💡 Understanding the Efficient Frontier</div>
-                    <p><strong>What This Chart Shows:</strong></p>
-                    <ul>
-                        <li>Each dot = A possible portfolio allocation</li>
-                        <li>X-axis (Volatility) = Risk</li>
-                        <li>Y-axis (Return) = Expected Return</li>
-                        <li>Color = Sharpe Ratio (brighter yellow = better)</li>
-                    </ul>
-                    <p><strong>Key Points:</strong></p>
-                    <ul>
-                        <li><strong>Blue circle:</strong> Your current portfolio</li>
-                        <li><strong>Red star:</strong> Optimal portfolio (highest Sharpe)</li>
-                        <li><strong>Upper edge:</strong> "Efficient frontier" - best return for each risk level</li>
-                    </ul>
-                    <p><strong>How to Read Your Position:</strong></p>
-                    <ul>
-                        <li><strong>Below and left of red star:</strong> You have lower risk but also lower return</li>
-                        <li><strong>Above and right of red star:</strong> You have higher risk for the return</li>
-                        <li><strong>On the frontier:</strong> You're efficient! Can't improve without changing risk</li>
-                        <li><strong>Below the frontier:</strong> You're inefficient - can get better returns for same risk</li>
-                    </ul>
-                    <p><strong>Action Items:</strong></p>
-                    <ul>
-                        <li>If you're far below the frontier, consider rebalancing</li>
-                        <li>If you're on or near the frontier, you're doing well</li>
-                        <li>Remember: This is based on PAST data - future may differ!</li>
-                    </ul>
-                </div>
-            """, unsafe_allow_html=True)
+                # Add current portfolio to plot
+                ax = fig.axes[0]
+                ax.scatter(current_annual_vol, current_annual_return, marker='o', color='blue',
+                        s=400, label='Current Portfolio', edgecolors='black', linewidths=2)
+                
+                # Update legend
+                ax.legend(loc='best', frameon=True, shadow=True, fontsize=11)
+                
+                st.pyplot(fig)
+                
+                # Efficient frontier interpretation
+                st.markdown("""
+                    <div class="interpretation-box">
+                        <div class="interpretation-title">💡 Understanding the Efficient Frontier</div>
+                        <p><strong>What This Chart Shows:</strong></p>
+                        <ul>
+                            <li>Each dot = A possible portfolio allocation</li>
+                            <li>X-axis (Volatility) = Risk</li>
+                            <li>Y-axis (Return) = Expected Return</li>
+                            <li>Color = Sharpe Ratio (brighter yellow = better)</li>
+                        </ul>
+                        <p><strong>Key Points:</strong></p>
+                        <ul>
+                            <li><strong>Blue circle:</strong> Your current portfolio</li>
+                            <li><strong>Red star:</strong> Optimal portfolio (highest Sharpe)</li>
+                            <li><strong>Upper edge:</strong> "Efficient frontier" - best return for each risk level</li>
+                        </ul>
+                        <p><strong>How to Read Your Position:</strong></p>
+                        <ul>
+                            <li><strong>Below and left of red star:</strong> You have lower risk but also lower return</li>
+                            <li><strong>Above and right of red star:</strong> You have higher risk for the return</li>
+                            <li><strong>On the frontier:</strong> You're efficient! Can't improve without changing risk</li>
+                            <li><strong>Below the frontier:</strong> You're inefficient - can get better returns for same risk</li>
+                        </ul>
+                        <p><strong>Action Items:</strong></p>
+                        <ul>
+                            <li>If you're far below the frontier, consider rebalancing</li>
+                            <li>If you're on or near the frontier, you're doing well</li>
+                            <li>Remember: This is based on PAST data - future may differ!</li>
+                        </ul>
+                    </div>
+                """, unsafe_allow_html=True)
             
             # Action Buttons
             st.markdown("---")
@@ -419,11 +538,7 @@ def render(tab9, portfolio_returns, prices, weights, tickers, metrics, current):
             
             with col3:
                 # Export optimal weights
-                export_weights = pd.DataFrame({
-                    'Ticker': list(optimal_weights_dict.keys()),
-                    'Weight': list(optimal_weights_dict.values())
-                })
-                csv = export_weights.to_csv(index=False)
+                csv = _weights_to_csv(tuple(zip(optimal_tickers, optimal_values)))
                 st.download_button(
                     label="📥 Export Optimal Weights",
                     data=csv,
@@ -2,6 +2,8 @@
 Tab: Trading Signals
 """
 
+from collections import Counter
+
 import streamlit as st
 import pandas as pd
 import numpy as np
@@ -11,6 +13,17 @@ from datetime import datetime, timedelta
 from helper_functions import *
 
 
+def _series_fingerprint(series):
+    """Identity for a price series: a hash of every value and index label"""
+    return (series.name, len(series), int(pd.util.hash_pandas_object(series, index=True).sum()))
+
+
+@st.cache_data(show_spinner=False, hash_funcs={pd.Series: _series_fingerprint})
+def _cached_signal(series, ticker):
+    """generate_trading_signal, computed once per ticker and price history"""
+    return generate_trading_signal(series, ticker)
+
+
 def render(tab10, portfolio_returns, prices, weights, tickers, metrics, current):
     """Render the Trading Signals tab"""
     
@@ -48,14 +61,22 @@ def render(tab10, portfolio_returns, prices, weights, tickers, metrics, current)
             
             st.markdown("### 🎯 Your Portfolio Holdings - Actionable Signals")
             
+            # Signals are computed once per ticker and reused by the summary counts below
+            signals = {
+                ticker: _cached_signal(prices[ticker], ticker)
+                for ticker in tickers if ticker in prices.columns
+            }
+            
             # Generate detailed signals for portfolio tickers
+            normalized_actions = []
             for ticker in tickers:
                 if ticker in prices.columns:
                     # Get comprehensive signal
-                    signal = generate_trading_signal(prices[ticker], ticker)
+                    signal = signals[ticker]
                     
                     # Extract data
                     sma_action = normalize_action(signal['action'])
+                    normalized_actions.append(sma_action)
                     sma_score = signal['score']
                     confidence = signal['confidence']
                     current_price = prices[ticker].iloc[-1]
@@ -313,13 +334,9 @@ def render(tab10, portfolio_returns, prices, weights, tickers, metrics, current)
             
             col1, col2, col3 = st.columns(3)
             
-            # Count signals across portfolio
-            buy_count = sum(1 for ticker in tickers if ticker in prices.columns and 
-                          normalize_action(generate_trading_signal(prices[ticker], ticker)['action']) == 'Buy')
-            hold_count = sum(1 for ticker in tickers if ticker in prices.columns and 
-                           normalize_action(generate_trading_signal(prices[ticker], ticker)['action']) == 'Hold')
-            sell_count = sum(1 for ticker in tickers if ticker in prices.columns and 
-                           normalize_action(generate_trading_signal(prices[ticker], ticker)['action']) == 'Sell')
+            # Count signals across portfolio (one pass over the actions collected above)
+            action_counts = Counter(normalized_actions)
+            buy_count, hold_count, sell_count = action_counts['Buy'], action_counts['Hold'], action_counts['Sell']
             
             with col1:
                 st.metric("🟢 Buy Signals", buy_count, help="Tickers showing buy signals")
@@ -485,7 +502,7 @@ def render(tab10, portfolio_returns, prices, weights, tickers, metrics, current)
                         continue
                     
                     # Generate signal using SAME function
-                    signal = generate_trading_signal(etf_prices, ticker)
+                    signal = _cached_signal(etf_prices, ticker)
                     
                     if signal is None:
                         errors.append(f"{ticker}: Signal generation failed")
@@ -579,7 +596,7 @@ def render(tab10, portfolio_returns, prices, weights, tickers, metrics, current)
                         portfolio_prices_ref = current['prices']
                         for ticker in current['tickers']:
                             if ticker in portfolio_prices_ref.columns:
-                                sig = generate_trading_signal(portfolio_prices_ref[ticker], ticker)
+                                sig = _cached_signal(portfolio_prices_ref[ticker], ticker)
                                 portfolio_signals[ticker] = {
                                     'action': normalize_action(sig['action']),
                                     'score': sig['score']
@@ -718,9 +735,8 @@ def render(tab10, portfolio_returns, prices, weights, tickers, metrics, current)
                 st.markdown("### 📈 Signal Summary")
                 
                 col1, col2, col3 = st.columns(3)
-                buy_count = len(signals_df[signals_df['Action'] == 'Buy'])
-                hold_count = len(signals_df[signals_df['Action'] == 'Hold'])
-                sell_count = len(signals_df[signals_df['Action'] == 'Sell'])
+                action_counts = Counter(signals_df['Action'])
+                buy_count, hold_count, sell_count = action_counts['Buy'], action_counts['Hold'], action_counts['Sell']
                 
                 with col1:
                     st.metric("🟢 Buy Signals", buy_count)
@@ -0,0 +1,70 @@
+"""
+Tests for the on-disk FileCache
+"""
+
+import os
+import time
+from datetime import timedelta
+
+from file_cache import FileCache
+
+
+def test_set_then_get_round_trip(tmp_path):
+    cache = FileCache(str(tmp_path))
+    info = {'longName': 'Test ETF', 'expenseRatio': 0.0003}
+
+    assert cache.set('SPY', 'info', info)
+    assert cache.get('SPY', 'info') == info
+
+
+def test_miss_returns_none(tmp_path):
+    cache = FileCache(str(tmp_path))
+    cache.set('SPY', 'info', {'a': 1})
+
+    assert cache.get('QQQ', 'info') is None
+    assert cache.get('SPY', 'info', params=('2y',)) is None
+
+
+def test_params_key_separate_entries(tmp_path):
+    cache = FileCache(str(tmp_path))
+    cache.set('SPY', 'history', [1, 2], params=('1y',))
+    cache.set('SPY', 'history', [3, 4], params=('2y',))
+
+    assert cache.get('SPY', 'history', params=('1y',)) == [1, 2]
+    assert cache.get('SPY', 'history', params=('2y',)) == [3, 4]
+
+
+def test_stale_entry_is_a_miss(tmp_path):
+    cache = FileCache(str(tmp_path))
+    cache.set('SPY', 'info', {'a': 1})
+    path = cache._path('SPY', 'info', ())
+    old = time.time() - 2 * 86400
+    os.utime(path, (old, old))
+
+    assert cache.get('SPY', 'info') is None
+    assert cache.get('SPY', 'info', ttl=timedelta(days=3)) == {'a': 1}
+    assert cache.get('SPY', 'info', ttl=3 * 86400) == {'a': 1}
+    assert cache.get('SPY', 'info', ttl=None) == {'a': 1}
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    cache = FileCache(str(tmp_path))
+    cache.set('SPY', 'info', {'a': 1})
+    with open(cache._path('SPY', 'info', ()), 'w') as f:
+        f.write('{"a": 1')
+
+    assert cache.get('SPY', 'info') is None
+
+
+def test_failed_write_keeps_previous_entry(tmp_path):
+    cache = FileCache(str(tmp_path))
+    cache.set('SPY', 'info', {'a': 1})
+    circular = {}
+    circular['self'] = circular
+
+    assert not cache.set('SPY', 'info', circular)
+    # The old file is untouched and no temp file is left behind
+    assert cache.get('SPY', 'info') == {'a': 1}
+    assert os.listdir(os.path.join(str(tmp_path), 'SPY')) == [
+        os.path.basename(cache._path('SPY', 'info', ()))
+    ]
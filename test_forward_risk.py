@@ -0,0 +1,33 @@
+"""
+Regression tests for calculate_forward_risk_metrics on returns containing NaNs
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import helper_functions as hf
+
+
+@pytest.mark.parametrize("use_numba", [True, False])
+def test_nans_match_pandas(monkeypatch, use_numba):
+    if use_numba and not hf.NUMBA_AVAILABLE:
+        pytest.skip("numba not installed")
+    monkeypatch.setattr(hf, 'NUMBA_AVAILABLE', use_numba)
+
+    returns = pd.Series(np.random.default_rng(5).normal(0.0003, 0.01, 799))
+    returns.iloc[[10, 300, 500]] = np.nan
+
+    metrics = hf.calculate_forward_risk_metrics(returns)
+
+    var_95 = returns.quantile(0.05)
+    expected = {
+        'Expected Annual Return': returns.mean() * 252,
+        'Expected Volatility': returns.std() * np.sqrt(252),
+        'VaR (95%)': var_95,
+        'CVaR (95%)': returns[returns <= var_95].mean(),
+        # Losing days over every day, NaNs included
+        'Probability of Daily Loss': (returns < 0).sum() / len(returns),
+    }
+    for key, value in expected.items():
+        np.testing.assert_allclose(metrics[key], value, rtol=1e-10, err_msg=key)
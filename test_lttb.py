@@ -0,0 +1,41 @@
+"""
+Tests for the LTTB chart downsampling helpers
+"""
+
+import numpy as np
+import pytest
+
+import helper_functions as hf
+
+
+def _random_walk(n, seed=3):
+    rng = np.random.default_rng(seed)
+    return np.arange(n, dtype=np.float64), np.cumsum(rng.normal(0, 1, n))
+
+
+@pytest.mark.parametrize("n, n_out", [(10_000, 2000), (5000, 3), (1001, 1000), (257, 50)])
+def test_shape_endpoints_and_order(n, n_out):
+    x, y = _random_walk(n)
+    for idx in (hf.lttb_downsample(x, y, n_out), hf._lttb_indices(x, y, n_out)):
+        assert len(idx) == n_out
+        assert idx[0] == 0
+        assert idx[-1] == n - 1
+        assert np.all(np.diff(idx) > 0)
+
+
+def test_jit_matches_python():
+    x, y = _random_walk(5000)
+    np.testing.assert_array_equal(hf.lttb_downsample(x, y, 500), hf._lttb_indices(x, y, 500))
+
+
+@pytest.mark.parametrize("n, n_out", [(100, 2000), (2000, 2000), (500, 2)])
+def test_short_input_passes_through(n, n_out):
+    x, y = _random_walk(n)
+    np.testing.assert_array_equal(hf.lttb_downsample(x, y, n_out), np.arange(n))
+
+
+def test_keeps_isolated_spike():
+    x = np.arange(10_000, dtype=np.float64)
+    y = np.zeros(10_000)
+    y[4321] = 50.0
+    assert 4321 in hf.lttb_downsample(x, y, 200)
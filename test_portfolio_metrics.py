@@ -0,0 +1,52 @@
+"""
+Regression tests for calculate_portfolio_metrics on returns containing NaNs
+"""
+
+import numpy as np
+import pandas as pd
+
+import helper_functions as hf
+
+
+def test_all_nan_returns_nan_metrics():
+    metrics = hf.calculate_portfolio_metrics(pd.Series([np.nan] * 10))
+
+    assert metrics['Total Return'] == 0.0
+    assert metrics['Annual Return'] == 0.0
+    assert metrics['Win Rate'] == 0.0
+    for key in ('Annual Volatility', 'Sharpe Ratio', 'Sortino Ratio', 'Max Drawdown', 'Calmar Ratio'):
+        assert np.isnan(metrics[key])
+
+
+def test_all_nan_respects_fields():
+    metrics = hf.calculate_portfolio_metrics(pd.Series([np.nan] * 10),
+                                             fields=('Total Return', 'Max Drawdown'))
+    assert set(metrics) == {'Total Return', 'Max Drawdown'}
+
+
+def test_interior_nans_match_pandas():
+    rng = np.random.default_rng(0)
+    returns = pd.Series(rng.normal(0.0005, 0.01, 300))
+    returns.iloc[[3, 50, 51, 200]] = np.nan
+
+    metrics = hf.calculate_portfolio_metrics(returns, risk_free_rate=0.02)
+
+    total_return = (1 + returns).prod() - 1
+    ann_return = (1 + total_return) ** (252 / len(returns)) - 1
+    ann_vol = returns.std() * np.sqrt(252)
+    downside_std = returns[returns < 0].std() * np.sqrt(252)
+    cum_returns = (1 + returns).cumprod()
+    max_drawdown = (cum_returns / cum_returns.cummax() - 1).min()
+
+    expected = {
+        'Total Return': total_return,
+        'Annual Return': ann_return,
+        'Annual Volatility': ann_vol,
+        'Sharpe Ratio': (ann_return - 0.02) / ann_vol,
+        'Sortino Ratio': (ann_return - 0.02) / downside_std,
+        'Max Drawdown': max_drawdown,
+        'Calmar Ratio': ann_return / abs(max_drawdown),
+        'Win Rate': (returns > 0).sum() / len(returns),
+    }
+    for key, value in expected.items():
+        np.testing.assert_allclose(metrics[key], value, rtol=1e-10, err_msg=key)
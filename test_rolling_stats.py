@@ -0,0 +1,60 @@
+"""
+Tests for calculate_rolling_ann_stats against pandas rolling on data with gaps
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import helper_functions as hf
+
+
+def _series_with_gaps(n=300, seed=7):
+    rng = np.random.default_rng(seed)
+    values = rng.normal(0.0005, 0.01, n)
+    values[[5, 40, 41, 42, 150]] = np.nan
+    values[200:230] = np.nan
+    return values
+
+
+def _pandas_reference(values, window, min_periods, risk_free_rate):
+    rolling = pd.Series(values).rolling(window, min_periods=min_periods)
+    ann_return = rolling.mean() * 252
+    ann_vol = rolling.std() * np.sqrt(252)
+    sharpe = (ann_return - risk_free_rate) / ann_vol
+    return np.column_stack([ann_return, ann_vol, sharpe])
+
+
+def _numpy_path(values, window, risk_free_rate, min_periods):
+    x = np.asarray(values, dtype=np.float64)[np.newaxis, :]
+    return hf._rolling_ann_stats_numpy(x, window, risk_free_rate, min_periods)[0]
+
+
+@pytest.mark.parametrize("min_periods", [None, 10])
+def test_matches_pandas_rolling_with_nans(min_periods):
+    values = _series_with_gaps()
+    window = 20
+    expected = _pandas_reference(values, window, min_periods, 0.02)
+
+    result = hf.calculate_rolling_ann_stats(values, window, 0.02, min_periods=min_periods)
+    np.testing.assert_allclose(result, expected, rtol=1e-7, atol=1e-10, equal_nan=True)
+
+    fallback = _numpy_path(values, window, 0.02, window if min_periods is None else min_periods)
+    np.testing.assert_allclose(fallback, expected, rtol=1e-7, atol=1e-10, equal_nan=True)
+
+
+def test_recovers_after_gap():
+    values = _series_with_gaps()
+    result = hf.calculate_rolling_ann_stats(values, 20)
+    # The 30-day gap ends at 229, so the first full window after it ends at 249
+    assert np.isnan(result[248]).all()
+    assert np.isfinite(result[249:]).all()
+
+
+def test_two_dimensional_matches_columns():
+    a = _series_with_gaps(seed=1)
+    b = _series_with_gaps(seed=2)
+    result = hf.calculate_rolling_ann_stats(np.column_stack([a, b]), 30, 0.0)
+    assert result.shape == (len(a), 2, 3)
+    np.testing.assert_allclose(result[:, 0], hf.calculate_rolling_ann_stats(a, 30, 0.0), equal_nan=True)
+    np.testing.assert_allclose(result[:, 1], hf.calculate_rolling_ann_stats(b, 30, 0.0), equal_nan=True)